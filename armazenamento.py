@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from mapeamento import mapeamento_hospital
+from colunas import COLUNAS_A_PREENCHER, criar_coluna_mesclada  # Reexportadas para quem já importava daqui
+
+# Diretório base do projeto (mesmo critério usado em treatment.py)
+caminho_base = os.path.dirname(os.path.abspath(__file__))
+
+# Arquivos gerados pelo treatment.py, em ordem de preferência de leitura
+ARQUIVOS_DADOS = [os.path.join(caminho_base, nome) for nome in
+                  ('data_work.parquet', 'data_work.feather', 'data_work.csv')]
+
+# Formatos de saída suportados, inferidos pela extensão do arquivo
+FORMATOS = {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.csv': 'csv'}
+
+# Colunas de data convertidas uma única vez no carregamento
+COLUNAS_DATA = ['data_internamento', 'data_hora_final', 'data_escore_diario', 'data_hora_obito', 'data_hora_alta',
+                'data_nascimento']
+
+# Textos de prioridade de atendimento do REDCap, na ordem da prioridade (código 0 = Prioridade 1)
+PRIORIDADES_ATENDIMENTO = [
+    "<b>Prioridade 1:</b> Paciente necessita de intervenções de suporte à vida, com alta probabilidade de recuperação e sem nenhuma limitação de suporte terapêutico.",
+    "<b>Prioridade 2:</b> Paciente necessita de monitorização intensiva, pelo alto risco de precisarem de intervenção imediata, e sem nenhuma limitação de suporte terapêutico.",
+    "<b>Prioridade 3:</b> Paciente necessita de intervenções de suporte à vida, com baixa probabilidade de recuperação ou com limitação de intervenção terapêutica.",
+    "<b>Prioridade 4:</b> Paciente necessita de monitorização intensiva, pelo alto risco de precisarem de intervenção imediata, mas com limitação de intervenção terapêutica.",
+    "<b>Prioridade 5:</b> Paciente com doença em fase de terminalidade, ou moribundos, sem possibilidade de recuperação. Em geral, esses pacientes não são apropriados para admissão na UTI (exceto se forem potenciais doadores de órgãos). No entanto, seu ingresso pode ser justificado em caráter excepcional, considerando as peculiaridades do caso e condicionado ao critério do médico intensivista.",
+]
+
+# Textos da escala de fragilidade (já sem HTML), na ordem dos códigos 1 a 9 gravados em 'fragilidade_num'
+FRAGILIDADES = [
+    "Muito Ativo - Pessoas que estão robustas, ativas, com energia e motivadas. Essas pessoas normalmente se exercitam regularmente. Elas estão entre as mais ativas para a sua idade.",
+    "Ativo - Pessoas que não apresentam nenhum sintoma ativo de doença, mas estão menos ativas que as da categoria I. Frequentemente se exercitam ou são muito ativas ocasionalmente, exemplo: em determinada época do ano.",
+    "Regular - pessoas com problemas de saúde bem controlados, mas não se exercitam regularmente além da caminhada de rotina.",
+    "Vulnerável - Apesar de não depender dos outros para ajuda diária, frequentemente os sintomas limitam as atividades. Uma queixa comum é sentir-se mais lento e/ou mais cansado ao longo do dia.",
+    "Levemente Frágil - Estas pessoas frequentemente apresentam lentidão evidente e precisam de ajuda para atividades instrumentais de vida diárias (AIVD) mais complexas (finanças, transporte, trabalho doméstico pesado, medicações). Tipicamente, a fragilidade leve progressivamente prejudica as compras e passeios desacompanhados, preparo de refeições e tarefas domésticas.",
+    "Moderadamente Frágil - Pessoas que precisam de ajuda em todas as atividades externas e na manutenção da casa. Em casa, frequentemente têm dificuldades com escadas e necessitam de ajuda no banho e podem necessitar de ajuda mínima (apoio próximo) para se vestirem.",
+    "Muito Frágil - Completamente dependentes para cuidados pessoais, por qualquer causa (física ou cognitiva). No entanto, são aparentemente estáveis e sem alto risco de morte (dentro de 6 meses).",
+    "Severamente Frágil - Completamente dependentes, aproximando-se do fim da vida. Tipicamente incapazes de se recuperarem de uma doença leve.",
+    "Doente Terminal - Aproximando-se do fim da vida. Esta categoria se aplica a pessoas com expectativa de vida < 6 meses, sem outra evidência de fragilidade.",
+]
+
+# Códigos inteiros gerados no treatment.py a partir dos textos acima (nulos quando o texto não é reconhecido)
+COLUNAS_CODIGOS = ['prioridade_atendimento_num', 'fragilidade_num']
+
+# Hospital de cada UTI, usado para organizar as partições (UTIs fora do mapeamento ficam em 'Outros')
+HOSPITAL_DA_UTI = {uti: hospital for hospital, utis in mapeamento_hospital.items() for uti in utis}
+
+# Esquema das colunas categóricas: categorias fixas, cuja posição é o código inteiro gravado no arquivo.
+# Valores encontrados fora do esquema são acrescentados ao final (em ordem alfabética), sem perda de dados;
+# None indica categorias definidas apenas pelos valores presentes.
+CATEGORIAS = {
+    'uti_combined': [uti for utis in mapeamento_hospital.values() for uti in utis],
+    'desfecho_uti': ['Alta', 'Óbito'],
+    'sav_admissao': ['A', 'B', 'C', 'D', 'E'],
+    'sav_obito': ['A', 'B', 'C', 'D', 'E'],
+    'prioridade_atendimento': PRIORIDADES_ATENDIMENTO,
+    'fragilidade': None,
+}
+
+
+def formato_arquivo(caminho, formato=None):
+    """Retorna o formato ('parquet', 'feather' ou 'csv') informado ou inferido pela extensão."""
+    if formato:
+        return formato
+    extensao = os.path.splitext(caminho)[1].lower()
+    return FORMATOS.get(extensao, 'csv')
+
+
+def localizar_dataset():
+    """Retorna o primeiro arquivo de dados existente (colunar tem preferência sobre CSV)."""
+    for caminho in ARQUIVOS_DADOS:
+        if os.path.exists(caminho):
+            return caminho
+    raise FileNotFoundError("Nenhum arquivo de dados encontrado. Execute o treatment.py primeiro.")
+
+
+def caminho_cubo(caminho_dados):
+    """Retorna o caminho da tabela agregada gerada ao lado do arquivo de dados (ex.: data_work_cubo.parquet)."""
+    base, extensao = os.path.splitext(caminho_dados)
+    return f"{base}_cubo{extensao}"
+
+
+def caminho_particoes(caminho_dados):
+    """Retorna o diretório com uma partição por hospital e UTI (ex.: data_work_particoes/INC/Ecoville.parquet)."""
+    base, _ = os.path.splitext(caminho_dados)
+    return f"{base}_particoes"
+
+
+def _arquivo_particao(diretorio, uti, extensao):
+    # Nomes de hospital e UTI viram diretório e arquivo; apenas separadores de caminho são trocados
+    def nome(texto):
+        return str(texto).replace('/', '_').replace('\\', '_')
+    return os.path.join(diretorio, nome(HOSPITAL_DA_UTI.get(uti, 'Outros')), nome(uti) + extensao)
+
+
+def caminho_particao(uti, caminho_dados):
+    """Retorna o arquivo da partição da UTI correspondente ao arquivo de dados."""
+    return _arquivo_particao(caminho_particoes(caminho_dados), uti, os.path.splitext(caminho_dados)[1])
+
+
+def assinatura_arquivo(caminho):
+    """Retorna (mtime em ns, tamanho em bytes) do arquivo, usado como versão do dataset."""
+    info = os.stat(caminho)
+    return info.st_mtime_ns, info.st_size
+
+
+def versao_dataset(caminho=None):
+    """Retorna uma string que muda sempre que o arquivo de dados ou a tabela agregada são regravados."""
+    caminho = caminho or localizar_dataset()
+    partes = [caminho, *assinatura_arquivo(caminho)]
+    if os.path.exists(caminho_cubo(caminho)):
+        partes.extend(assinatura_arquivo(caminho_cubo(caminho)))
+    return ':'.join(str(parte) for parte in partes)
+
+
+def ler_dataset(caminho, colunas=None):
+    """Lê o arquivo de dados (somente as colunas pedidas), com as datas como datetime e as categorias do esquema."""
+    formato = formato_arquivo(caminho)
+    colunas = list(colunas) if colunas else None
+    if formato == 'parquet':
+        df = pd.read_parquet(caminho, columns=colunas)
+    elif formato == 'feather':
+        df = pd.read_feather(caminho, columns=colunas)
+    else:
+        df = pd.read_csv(caminho, encoding='utf-8', usecols=colunas)
+    return _converter_tipos(df)
+
+
+def dataset_vazio(caminho, colunas=None):
+    """Retorna um DataFrame sem linhas com as colunas e os tipos que ler_dataset daria ao arquivo.
+
+    Em Parquet e Feather apenas o esquema é lido; no CSV, só o cabeçalho (as colunas que não são datas,
+    códigos ou categorias ficam como texto).
+    """
+    formato = formato_arquivo(caminho)
+    colunas = list(colunas) if colunas else None
+    if formato == 'csv':
+        return _converter_tipos(pd.read_csv(caminho, encoding='utf-8', usecols=colunas, nrows=0))
+    if formato == 'parquet':
+        esquema = pq.read_schema(caminho)
+    else:
+        with pa.memory_map(caminho) as arquivo:
+            esquema = pa.ipc.open_file(arquivo).schema
+    tabela = esquema.empty_table()
+    return _converter_tipos((tabela.select(colunas) if colunas else tabela).to_pandas())
+
+
+def _converter_tipos(df):
+    # Datas como datetime, códigos como Int8 e categorias do esquema, qualquer que seja o formato lido
+    for coluna in COLUNAS_DATA:
+        if coluna in df.columns and not pd.api.types.is_datetime64_any_dtype(df[coluna]):
+            df[coluna] = pd.to_datetime(df[coluna], format='ISO8601', errors='coerce')
+    for coluna in COLUNAS_CODIGOS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype('Int8')
+    # Parquet e Feather já guardam o tipo category; o CSV volta como texto e é recodificado aqui
+    return aplicar_categorias(df)
+
+
+def aplicar_categorias(df):
+    """Converte no lugar as colunas de CATEGORIAS presentes em df para o tipo category do esquema."""
+    for coluna, categorias in CATEGORIAS.items():
+        if coluna not in df.columns:
+            continue
+        serie = df[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            valores = serie.cat.categories
+        else:
+            serie = serie.where(serie.isna(), serie.astype(str))
+            valores = serie.dropna().unique()
+        fixas = list(categorias or [])
+        extras = sorted(set(valores) - set(fixas))
+        df[coluna] = pd.Categorical(serie, categories=fixas + extras)
+    return df
+
+
+def preparar_colunar(df):
+    """Normaliza tipos para gravação em Parquet/Feather, que exigem um tipo por coluna."""
+    df = df.copy()
+    for coluna in df.columns:
+        if coluna in COLUNAS_DATA:
+            df[coluna] = pd.to_datetime(df[coluna], format='ISO8601', errors='coerce')
+        elif df[coluna].dtype == object and pd.api.types.infer_dtype(df[coluna], skipna=True) != 'string':
+            # Colunas com tipos misturados (ex.: números e textos) são gravadas como texto
+            df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+    return df
+
+
+def salvar_dataset(df, caminho, formato=None):
+    """Salva o DataFrame de forma atômica.
+
+    O formato ('csv', 'parquet' ou 'feather') é inferido pela extensão quando não informado.
+    O arquivo é escrito em um temporário e renomeado, de modo que o dashboard nunca leia um arquivo
+    pela metade. O cache do dashboard (carregamento.py) percebe a troca pela nova assinatura
+    (mtime, tamanho) do arquivo: não há o que invalidar a partir do processo que grava.
+    """
+    formato = formato_arquivo(caminho, formato)
+    caminho_temp = caminho + '.tmp'
+    if formato == 'parquet':
+        preparar_colunar(df).to_parquet(caminho_temp, index=False)
+    elif formato == 'feather':
+        preparar_colunar(df).reset_index(drop=True).to_feather(caminho_temp)
+    else:
+        df.to_csv(caminho_temp, index=False)
+    os.replace(caminho_temp, caminho)
+
+
+def salvar_particoes(df, caminho_dados, formato=None):
+    """Grava uma partição por UTI (agrupadas por hospital) ao lado do arquivo de dados.
+
+    As partições são escritas em um diretório temporário que depois substitui o anterior,
+    para que uma UTI nunca seja lida a partir de um conjunto misturado de execuções.
+    """
+    destino = caminho_particoes(caminho_dados)
+    temporario = destino + '.tmp'
+    extensao = os.path.splitext(caminho_dados)[1]
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+    for uti, parte in df.groupby('uti_combined', observed=True, sort=False):
+        caminho = _arquivo_particao(temporario, uti, extensao)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        salvar_dataset(parte, caminho, formato)
+    _substituir_diretorio(temporario, destino)
+
+
+def _substituir_diretorio(temporario, destino):
+    # Troca o diretório de partições pelo recém-gravado, mantendo o anterior até a troca terminar
+    antigo = destino + '.old'
+    shutil.rmtree(antigo, ignore_errors=True)
+    if os.path.exists(destino):
+        os.replace(destino, antigo)
+    os.replace(temporario, destino)
+    shutil.rmtree(antigo, ignore_errors=True)
+
+
+def _tipo_comum(tipos):
+    # Blocos sem nenhum valor (tipo null) não contam; números misturados viram float e outras misturas, texto
+    tipos = [tipo for tipo in tipos if not pa.types.is_null(tipo)]
+    if not tipos:
+        return pa.null()
+    if all(tipo == tipos[0] for tipo in tipos):
+        return tipos[0]
+    if all(pa.types.is_integer(tipo) or pa.types.is_floating(tipo) for tipo in tipos):
+        return pa.float64()
+    if all(pa.types.is_dictionary(tipo) for tipo in tipos):
+        return pa.dictionary(pa.int32(), _tipo_comum([tipo.value_type for tipo in tipos]))
+    return pa.string()
+
+
+def esquema_comum(esquemas, categorias=True):
+    """Retorna um esquema Arrow que acomoda as colunas de todos os blocos.
+
+    Com categorias=False, as colunas categóricas (dicionários) são gravadas como texto. Os metadados do
+    primeiro bloco (tipos do pandas, como Int8) são mantidos, para que o arquivo seja lido com os mesmos
+    tipos do tratamento em memória.
+    """
+    campos = []
+    for nome in esquemas[0].names:
+        tipo = _tipo_comum([esquema.field(nome).type for esquema in esquemas])
+        if not categorias and pa.types.is_dictionary(tipo):
+            tipo = tipo.value_type
+        campos.append(pa.field(nome, tipo))
+    return pa.schema(campos, metadata=esquemas[0].metadata)
+
+
+def _abrir_gravador(caminho, formato, esquema):
+    # Retorna (escrever, fechar) para gravar um arquivo uma tabela Arrow por vez
+    if formato == 'parquet':
+        gravador = pq.ParquetWriter(caminho, esquema)
+        return gravador.write_table, gravador.close
+    if formato == 'feather':
+        gravador = pa.ipc.new_file(caminho, esquema)
+        return gravador.write_table, gravador.close
+    pd.DataFrame(columns=esquema.names).to_csv(caminho, index=False)
+
+    def escrever(tabela):
+        tabela.to_pandas().to_csv(caminho, mode='a', header=False, index=False)
+
+    return escrever, lambda: None
+
+
+def _agrupar_tabelas(tabelas, limite_bytes):
+    # Junta tabelas consecutivas até limite_bytes: cada grupo vira um único grupo de linhas no arquivo
+    grupo, tamanho = [], 0
+    for tabela in tabelas:
+        grupo.append(tabela)
+        tamanho += tabela.nbytes
+        if tamanho >= limite_bytes:
+            yield pa.concat_tables(grupo)
+            grupo, tamanho = [], 0
+    if grupo:
+        yield pa.concat_tables(grupo)
+
+
+def _ler_ipc(caminho):
+    with pa.memory_map(caminho) as arquivo:
+        return pa.ipc.open_file(arquivo).read_all()
+
+
+def salvar_blocos(blocos, caminho_dados, formato=None, limite_mb=64):
+    """Grava o arquivo de dados e as partições por UTI a partir de blocos já tratados (arquivos Parquet).
+
+    Os blocos são lidos um de cada vez e reunidos em grupos de linhas de até `limite_mb`, de modo que a
+    memória usada não depende do tamanho total dos dados. As linhas de cada UTI são separadas durante a
+    gravação do arquivo completo e as partições são gravadas depois, uma UTI por vez.
+    Como em salvar_particoes e salvar_dataset, tudo é escrito em temporários: as partições são trocadas
+    primeiro e o arquivo de dados por último. Em Feather, cujos lotes não podem trocar de dicionário,
+    as categorias são gravadas como texto e recodificadas na leitura (ler_dataset). Como em salvar_dataset,
+    o dashboard percebe os novos arquivos pela assinatura (mtime, tamanho).
+    """
+    formato = formato_arquivo(caminho_dados, formato)
+    esquema = esquema_comum([pq.ParquetFile(bloco).schema_arrow for bloco in blocos],
+                            categorias=formato == 'parquet')
+    limite_bytes = limite_mb * 1024 * 1024
+    destino = caminho_particoes(caminho_dados)
+    temporario = destino + '.tmp'
+    pedacos = destino + '.pedacos'
+    extensao = os.path.splitext(caminho_dados)[1]
+    for diretorio in (temporario, pedacos):
+        shutil.rmtree(diretorio, ignore_errors=True)
+        os.makedirs(diretorio)
+
+    # Arquivos com as linhas de cada UTI, bloco a bloco
+    pedacos_da_uti = {}
+
+    def ler_blocos():
+        for numero, bloco in enumerate(blocos):
+            tabela = pq.ParquetFile(bloco).read().select(esquema.names).cast(esquema)
+            utis = tabela.column('uti_combined').to_pandas()
+            for posicao, uti in enumerate(utis.dropna().unique()):
+                caminho = os.path.join(pedacos, f'{numero:05d}_{posicao:03d}.arrow')
+                with pa.ipc.new_file(caminho, esquema) as gravador:
+                    gravador.write_table(tabela.filter(pa.array((utis == uti).to_numpy())))
+                pedacos_da_uti.setdefault(uti, []).append(caminho)
+            yield tabela
+
+    try:
+        caminho_temp = caminho_dados + '.tmp'
+        escrever, fechar = _abrir_gravador(caminho_temp, formato, esquema)
+        for grupo in _agrupar_tabelas(ler_blocos(), limite_bytes):
+            escrever(grupo)
+        fechar()
+
+        for uti, arquivos in pedacos_da_uti.items():
+            caminho = _arquivo_particao(temporario, uti, extensao)
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            escrever, fechar = _abrir_gravador(caminho, formato, esquema)
+            for grupo in _agrupar_tabelas(map(_ler_ipc, arquivos), limite_bytes):
+                escrever(grupo)
+            fechar()
+    finally:
+        shutil.rmtree(pedacos, ignore_errors=True)
+
+    _substituir_diretorio(temporario, destino)
+    os.replace(caminho_temp, caminho_dados)
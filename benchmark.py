@@ -0,0 +1,609 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks das etapas do treatment.py com dados sintéticos.
+
+Uso:
+    python benchmark.py split --linhas 500000
+    python benchmark.py idade --linhas 1000000
+    python benchmark.py data_final --linhas 1000000
+    python benchmark.py ffill --linhas 1000000
+    python benchmark.py colunas --linhas 100000
+    python benchmark.py ocupacao --linhas 1000000
+    python benchmark.py censo --linhas 1000000
+    python benchmark.py mortalidade --linhas 1000000
+    python benchmark.py pipeline --escalas 10000 100000 1000000 --saida benchmark_pipeline.json
+    python benchmark.py pipeline --escalas 10000 --comparar benchmark_anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import warnings
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import armazenamento
+import cache_figuras
+import carregamento
+import censo
+import export
+import graficos
+import mortalidade
+import ocupacao
+import treatment
+from colunas import COLUNAS_A_PREENCHER, criar_coluna_mesclada
+from mapeamento import mapeamento_hospital
+
+# Colunas de UTI preenchidas por id em treatment.transform
+COLUNAS_UTI = COLUNAS_A_PREENCHER
+
+# UTIs sorteadas em cada coluna de UTI da exportação ('uti_hr' não tem UTI no mapeamento e fica em 'Outros')
+UTIS_POR_COLUNA = {
+    'uti_inc': mapeamento_hospital['INC'],
+    'uti_vita': mapeamento_hospital['Vita Batel'],
+    'uti_santa_casa': mapeamento_hospital['Santa Casa'],
+    'uti_im': mapeamento_hospital['Instituto de Medicina'],
+    'uti_nacoes': mapeamento_hospital['Hospital das Nações'],
+    'uti_sao_rafael': mapeamento_hospital['Hospital São Rafael'],
+    'uti_hr': ['HR UTI'],
+    'uti_hsl': mapeamento_hospital['São Lucas'],
+}
+
+# Linhas geradas por vez ao escrever a exportação sintética (limita a memória nas escalas grandes)
+LINHAS_POR_PARTE = 50000
+
+
+def gerar_internamentos(linhas, semente=0):
+    """Gera internamentos sintéticos com duração de 1 hora a 90 dias entre 2022 e 2024."""
+    rng = np.random.default_rng(semente)
+    inicio = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 60 * 24 * 365 * 3, linhas), unit='min')
+    fim = inicio + pd.to_timedelta(rng.integers(60, 60 * 24 * 90, linhas), unit='min')
+    df = pd.DataFrame({
+        'id': np.arange(linhas),
+        'uti_combined': rng.choice(['Ecoville', 'Vita Batel 1', 'IM UTI 5', 'São Lucas'], linhas),
+        'data_internamento': inicio,
+        'data_hora_final': fim,
+        'apache': rng.integers(0, 40, linhas),
+        'data_nascimento': pd.Timestamp('1930-01-01') + pd.to_timedelta(rng.integers(0, 365 * 80, linhas), unit='D'),
+    })
+    # Alguns internamentos sem data de saída e alguns sem data de nascimento
+    df.loc[df.sample(frac=0.02, random_state=semente).index, 'data_hora_final'] = pd.NaT
+    df.loc[df.sample(frac=0.01, random_state=semente + 1).index, 'data_nascimento'] = pd.NaT
+    return df
+
+
+def gerar_exportacao_utis(linhas, semente=0):
+    """Gera linhas no formato da exportação do REDCap: vários eventos por 'id', com a UTI só no primeiro."""
+    rng = np.random.default_rng(semente)
+    ids = np.repeat(np.arange(linhas), rng.integers(1, 7, linhas))[:linhas]
+    primeiro = np.r_[True, ids[1:] != ids[:-1]]
+    df = pd.DataFrame({'id': ids})
+    coluna_da_uti = rng.integers(0, len(COLUNAS_UTI), linhas)
+    for i, coluna in enumerate(COLUNAS_UTI):
+        df[coluna] = np.where(primeiro & (coluna_da_uti == i), f'{coluna} A', None)
+    return df
+
+
+def gerar_exportacao_colunas(linhas, semente=0, checkbox=600, texto=60, excluidas=12):
+    """Gera uma exportação larga: colunas de checkbox ('campo___n'), de texto livre e colunas a excluir.
+
+    Retorna (DataFrame, novo_nome_colunas, exclusao_colunas).
+    """
+    rng = np.random.default_rng(semente)
+    dados = {'id': np.arange(linhas)}
+    novo_nome_colunas = {}
+    for i in range(checkbox):
+        coluna = f'campo_{i // 5}___{i % 5 + 1}'
+        dados[coluna] = rng.choice(np.array(['Checked', 'Unchecked'], dtype=object), linhas)
+        novo_nome_colunas[coluna] = f'campo_{i // 5}_opcao_{i % 5 + 1}'
+    frases = np.array([f'Texto livre número {i} ' * 8 for i in range(50)], dtype=object)
+    for i in range(texto):
+        dados[f'texto_{i}'] = rng.choice(frases, linhas)
+    exclusao_colunas = [f'excluida_{i}' for i in range(excluidas)]
+    for coluna in exclusao_colunas:
+        dados[coluna] = rng.choice(frases, linhas)
+    return pd.DataFrame(dados), novo_nome_colunas, exclusao_colunas
+
+
+def gerar_exportacao_redcap(linhas, hoje, semente=0, primeiro_id=1):
+    """Gera uma exportação sintética no formato do REDCap, com as colunas reais lidas pelo tratamento.
+
+    As colunas são as do esquema (esquema_redcap.json), as de checkbox de treatment.NOVO_NOME_COLUNAS e as de
+    treatment.COLUNAS_EXCLUIR. Cada internamento tem uma linha principal e até dois escores diários (linhas
+    repetidas do mesmo 'id'), com admissão nos três anos anteriores a 'hoje'. Os valores são texto, como no CSV.
+    """
+    rng = np.random.default_rng(semente)
+    pacientes = linhas // 2 + 1
+    repeticoes = rng.integers(1, 4, pacientes)
+    # Quando o sorteio não completa 'linhas' linhas, o último paciente recebe as que faltam
+    repeticoes[-1] += max(0, linhas - repeticoes.sum())
+    ids = np.repeat(np.arange(primeiro_id, primeiro_id + pacientes), repeticoes)[:linhas]
+    principal = np.r_[True, ids[1:] != ids[:-1]]
+    paciente = np.cumsum(principal) - 1
+    instancia = np.arange(linhas) - np.flatnonzero(principal)[paciente]
+    n = int(principal.sum())
+
+    def nas_principais(valores):
+        coluna = np.full(linhas, None, dtype=object)
+        coluna[principal] = valores
+        return coluna
+
+    def nos_escores(valores):
+        return np.where(principal, None, valores)
+
+    def datas(valores, formato='%Y-%m-%d %H:%M'):
+        return pd.Series(valores).dt.strftime(formato).to_numpy(dtype=object)
+
+    def sorteio(opcoes, p=None):
+        return rng.choice(np.array(opcoes, dtype=object), n, p=p)
+
+    admissao = hoje - pd.DateOffset(years=3) + pd.to_timedelta(rng.integers(0, 60 * 24 * 365 * 3, n), unit='min')
+    duracao = pd.to_timedelta(rng.integers(2, 24 * 80, n), unit='h')
+    saida = admissao + duracao
+    obito = rng.random(n) < 0.15
+    aberto = (saida > hoje) | (rng.random(n) < 0.03)
+    dias = np.asarray(duracao.days, dtype=float)
+
+    dados = {'id': ids, 'redcap_repeat_instrument': nos_escores('escores_diarios'),
+             'redcap_repeat_instance': nos_escores(instancia)}
+    coluna_da_uti = rng.integers(0, len(COLUNAS_UTI), n)
+    for i, coluna in enumerate(COLUNAS_UTI):
+        dados[coluna] = nas_principais(np.where(coluna_da_uti == i, sorteio(UTIS_POR_COLUNA[coluna]), None))
+    dados.update({
+        'data_internamento': nas_principais(datas(admissao)),
+        'data_hora_obito': nas_principais(np.where(obito & ~aberto, datas(saida), None)),
+        'data_hora_alta': nas_principais(np.where(~obito & ~aberto, datas(saida), None)),
+        'tempo_internamento_obito': nas_principais(np.where(obito, dias, np.nan)),
+        'tempo_internamento_alta': nas_principais(np.where(obito, np.nan, dias)),
+        'data_nascimento': nas_principais(datas(pd.Timestamp('1930-01-01') + pd.to_timedelta(
+            rng.integers(0, 365 * 80, n), unit='D'), '%Y-%m-%d')),
+        'desfecho_uti': nas_principais(np.where(aberto, None, np.where(obito, 'Óbito', 'Alta'))),
+        'procedencia': nas_principais(sorteio(['Centro Cirúrgico', 'Enfermaria', 'Hemodinâmica',
+                                               'Pronto Atendimento', 'Outro hospital'])),
+        'especialidade': nas_principais(sorteio(['Cirurgia Cardíaca', 'Neurocirurgia', 'Neurologia',
+                                                 'Clínica Médica'])),
+        'sexo': nas_principais(sorteio(['Feminino', 'Masculino'])),
+        'apache': nas_principais(rng.integers(0, 40, n)),
+        'sav_admissao': nas_principais(sorteio(list('ABCDE'))),
+        'sav_obito': nas_principais(np.where(obito, sorteio(list('ABCDE')), None)),
+        'duracao_internamento': nas_principais(dias),
+        'reinternamento': nas_principais(sorteio(['Sim', 'Não'], [0.05, 0.95])),
+        'mesmo_cid_24h': nas_principais(sorteio(['Sim', 'Não'], [0.03, 0.97])),
+        'prioridade_atendimento': nas_principais(sorteio(armazenamento.PRIORIDADES_ATENDIMENTO)),
+        'fragilidade': nas_principais(sorteio([f'<p>{texto}</p>' for texto in armazenamento.FRAGILIDADES])),
+        'data_escore_diario': nos_escores(datas(admissao[paciente].normalize() + pd.to_timedelta(instancia, unit='D'),
+                                                '%Y-%m-%d')),
+        'sofa': nos_escores(rng.integers(0, 20, linhas)),
+    })
+    for coluna in treatment.carregar_esquema_redcap()['colunas']:
+        dados.setdefault(coluna, nas_principais(sorteio(['Texto livre do prontuário', None])))
+    checkbox = np.array(['Checked', 'Unchecked'], dtype=object)
+    for coluna in [*treatment.NOVO_NOME_COLUNAS, *treatment.COLUNAS_EXCLUIR]:
+        if coluna not in dados:
+            dados[coluna] = nas_principais(rng.choice(checkbox, n, p=[0.1, 0.9]) if '___' in coluna
+                                           else sorteio(['Texto livre do prontuário', None]))
+    return pd.DataFrame(dados)
+
+
+def escrever_exportacao_redcap(caminho, linhas, hoje, semente=0):
+    """Escreve a exportação sintética (gerar_exportacao_redcap) em CSV, em partes de LINHAS_POR_PARTE linhas."""
+    gravador = None
+    primeiro_id = 1
+    try:
+        for parte, inicio in enumerate(range(0, linhas, LINHAS_POR_PARTE)):
+            df = gerar_exportacao_redcap(min(LINHAS_POR_PARTE, linhas - inicio), hoje, semente + parte, primeiro_id)
+            primeiro_id = int(df['id'].iloc[-1]) + 1
+            tabela = pa.Table.from_pandas(df.astype(str).where(df.notna()), preserve_index=False)
+            if gravador is None:
+                gravador = pacsv.CSVWriter(caminho, tabela.schema)
+            gravador.write_table(tabela)
+    finally:
+        if gravador is not None:
+            gravador.close()
+
+
+def colunas_por_dataframe(caminho, novo_nome_colunas, exclusao_colunas):
+    """Implementação anterior (rename, replace em todas as células e drop), mantida como referência."""
+    df = pd.read_csv(caminho)
+    df.rename(columns=novo_nome_colunas, inplace=True)
+    df = df.loc[:, ~df.columns.duplicated(keep='last')]
+    df.replace({'Checked': 'Sim', 'Unchecked': 'Não'}, inplace=True)
+    df.drop(columns=exclusao_colunas, inplace=True)
+    return df
+
+
+def colunas_por_esquema(caminho, novo_nome_colunas, exclusao_colunas):
+    esquema = treatment.esquema_entrada(pd.read_csv(caminho, nrows=0).columns, novo_nome_colunas, exclusao_colunas)
+    df = pd.read_csv(caminho, usecols=esquema['colunas'])
+    treatment.aplicar_esquema(df, esquema)
+    return df
+
+
+def split_admissions_iterrows(admissions):
+    """Implementação anterior (iterrows), mantida apenas como referência de desempenho."""
+    new_admissions = []
+    for _, admission in admissions.iterrows():
+        start_date = admission['data_internamento']
+        end_date = admission['data_hora_final']
+        if pd.isna(start_date) or pd.isna(end_date):
+            admission['data_ajustada'] = None
+            new_admissions.append(admission.to_dict())
+            continue
+        if start_date.month != end_date.month:
+            last_day_of_month = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+            first_part = admission.to_dict()
+            first_part['data_internamento'] = start_date.strftime('%Y-%m-%d %H:%M')
+            first_part['data_hora_final'] = last_day_of_month.strftime('%Y-%m-%d %H:%M')
+            first_part['data_ajustada'] = (last_day_of_month - start_date).days
+            new_admissions.append(first_part)
+            second_part = admission.to_dict()
+            second_part['data_internamento'] = (last_day_of_month + timedelta(days=1)).strftime('%Y-%m-%d %H:%M')
+            second_part['data_hora_final'] = end_date.strftime('%Y-%m-%d %H:%M')
+            second_part['data_ajustada'] = (end_date - (last_day_of_month + timedelta(days=1))).days
+            new_admissions.append(second_part)
+        else:
+            admission['data_ajustada'] = (end_date - start_date).days
+            new_admissions.append(admission.to_dict())
+    result = pd.DataFrame(new_admissions)
+    result['data_ajustada'] += 1
+    return result
+
+
+def calcular_idade_por_linha(data_nascimento):
+    """Implementação anterior (datetime.now() a cada linha), mantida apenas como referência de desempenho."""
+    hoje = datetime.now()
+    return hoje.year - data_nascimento.year - ((hoje.month, hoje.day) < (data_nascimento.month, data_nascimento.day))
+
+
+def preencher_data_hora_final_apply(df):
+    """Implementação anterior (df.apply por linha), mantida apenas como referência de desempenho."""
+    data_atual = pd.to_datetime(datetime.now().strftime('%Y-%m-%d'))
+    df['data_hora_final'] = df.apply(
+        lambda row: data_atual if pd.notnull(row['data_internamento']) and pd.isnull(row['data_hora_final'])
+        else row['data_hora_final'], axis=1)
+
+
+def data_hora_final_por_texto(df, hoje):
+    """Caminho anterior ao esquema de leitura (datas mescladas como texto), mantido como referência de resultado.
+
+    Com óbito e alta preenchidos, o texto 'óbito|alta' não era reconhecido como data e o internamento
+    ficava em aberto até 'hoje'.
+    """
+    texto = df[['data_internamento']].copy()
+    for coluna in ('data_hora_obito', 'data_hora_alta'):
+        texto[coluna] = df[coluna].dt.strftime('%Y-%m-%d %H:%M').astype(object).where(df[coluna].notna(), None)
+    criar_coluna_mesclada(texto, ['data_hora_obito', 'data_hora_alta'], 'data_hora_final')
+    texto['data_hora_final'] = pd.to_datetime(texto['data_hora_final'], format='%Y-%m-%d %H:%M', errors='coerce')
+    treatment.preencher_data_hora_final(texto, hoje)
+    return texto['data_hora_final']
+
+
+def transform_por_coluna(df, colunas):
+    """Implementação anterior (um groupby e fillna(method='ffill') por coluna), mantida como referência."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        for coluna in colunas:
+            df[coluna] = df.groupby('id')[coluna].fillna(method='ffill')
+
+
+def ocupacao_por_expansao(inicio, fim, unidades):
+    """Leitos-dia ocupados expandindo cada internamento em uma linha por dia, mantido como referência."""
+    validos = inicio.notna() & fim.notna() & (fim > inicio)
+    inicio, fim, unidades = inicio[validos].to_numpy(), fim[validos].to_numpy(), unidades[validos].to_numpy()
+    primeiro = inicio.astype('datetime64[D]')
+    dias = ((fim - np.timedelta64(1, 'ns')).astype('datetime64[D]') - primeiro).astype(np.int64) + 1
+    linha = np.repeat(np.arange(len(inicio)), dias)
+    dia = primeiro[linha] + (np.arange(len(linha)) - np.repeat(np.cumsum(dias) - dias, dias)).astype('timedelta64[D]')
+    um_dia = np.timedelta64(1, 'D')
+    fracao = (np.minimum(fim[linha], dia + um_dia) - np.maximum(inicio[linha], dia)) / um_dia
+    expandido = pd.DataFrame({'dia': dia, 'uti': unidades[linha], 'ocupados': fracao})
+    return expandido.groupby(['dia', 'uti'])['ocupados'].sum().unstack(fill_value=0.0)
+
+
+def cronometrar(funcao, *args):
+    """Executa a função e retorna (resultado, segundos)."""
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def bench_split(linhas, referencia=True):
+    df = gerar_internamentos(linhas)
+    resultado, tempo = cronometrar(treatment.split_admissions, df)
+    print(f"split_admissions (vetorizado): {linhas} linhas -> {len(resultado)} segmentos em {tempo:.3f} s "
+          f"({linhas / tempo:,.0f} linhas/s)")
+    if referencia:
+        resultado_ref, tempo_ref = cronometrar(split_admissions_iterrows, df)
+        print(f"split_admissions (iterrows):   {linhas} linhas -> {len(resultado_ref)} segmentos em {tempo_ref:.3f} s "
+              f"({linhas / tempo_ref:,.0f} linhas/s)")
+        print(f"Aceleração: {tempo_ref / tempo:.1f}x")
+
+
+def relatar(descricao, linhas, tempo):
+    print(f"{descricao}: {linhas} linhas em {tempo:.3f} s ({linhas / tempo:,.0f} linhas/s)")
+
+
+def bench_idade(linhas, referencia=True):
+    df = gerar_internamentos(linhas)
+    hoje = pd.Timestamp.now()
+    resultado, tempo = cronometrar(treatment.calcular_idade, df['data_nascimento'], hoje)
+    relatar("calcular_idade (vetorizado)", linhas, tempo)
+    if referencia:
+        resultado_ref, tempo_ref = cronometrar(df['data_nascimento'].apply, calcular_idade_por_linha)
+        relatar("calcular_idade (apply)    ", linhas, tempo_ref)
+        print(f"Resultados iguais: {resultado.equals(resultado_ref.astype(resultado.dtype))}")
+        print(f"Aceleração: {tempo_ref / tempo:.1f}x")
+
+
+def bench_data_final(linhas, referencia=True):
+    df = gerar_internamentos(linhas)
+    vetorizado = df[['data_internamento', 'data_hora_final']].copy()
+    _, tempo = cronometrar(treatment.preencher_data_hora_final, vetorizado)
+    relatar("preencher_data_hora_final (vetorizado)", linhas, tempo)
+    if referencia:
+        por_linha = df[['data_internamento', 'data_hora_final']].copy()
+        _, tempo_ref = cronometrar(preencher_data_hora_final_apply, por_linha)
+        relatar("preencher_data_hora_final (apply)    ", linhas, tempo_ref)
+        print(f"Resultados iguais: {vetorizado.equals(por_linha)}")
+        print(f"Aceleração: {tempo_ref / tempo:.1f}x")
+
+    # Mudança de resultado do esquema de leitura: as datas de óbito e alta chegam como datetime e, quando as duas
+    # estão preenchidas (1% dos internamentos encerrados aqui), a saída é a do óbito em vez de 'hoje'
+    rng = np.random.default_rng(2)
+    hoje = pd.Timestamp.now().normalize()
+    obito = rng.random(linhas) < 0.15
+    ambas = df['data_hora_final'].notna() & (rng.random(linhas) < 0.01)
+    alta = df['data_hora_final'].where(~obito | ambas) + pd.Timedelta(hours=2) * ambas
+    saidas = pd.DataFrame({'data_internamento': df['data_internamento'],
+                           'data_hora_obito': df['data_hora_final'].where(obito | ambas), 'data_hora_alta': alta})
+    atual = saidas.copy()
+    criar_coluna_mesclada(atual, ['data_hora_obito', 'data_hora_alta'], 'data_hora_final')
+    treatment.preencher_data_hora_final(atual, hoje)
+    anterior = data_hora_final_por_texto(saidas, hoje)
+    diferentes = atual['data_hora_final'].ne(anterior) & ~(atual['data_hora_final'].isna() & anterior.isna())
+    print(f"data_hora_final com óbito e alta: {int(diferentes.sum())} linha(s) diferentes da mesclagem como texto; "
+          f"todas com as duas datas: {diferentes.equals(ambas)}; "
+          f"nelas vale o óbito: {atual.loc[ambas, 'data_hora_final'].equals(saidas.loc[ambas, 'data_hora_obito'])} "
+          f"(antes: 'hoje' em {int((anterior[ambas] == hoje).sum())})")
+
+
+def bench_ffill(linhas, referencia=True):
+    df = gerar_exportacao_utis(linhas)
+    contiguo = df.copy()
+    _, tempo = cronometrar(treatment.transform, contiguo, COLUNAS_UTI)
+    relatar("transform (ids contíguos, numpy)", linhas, tempo)
+    # Mesmas linhas fora de ordem: caminho com um único groupby
+    embaralhado = df.sample(frac=1, random_state=0)
+    _, tempo_groupby = cronometrar(treatment.transform, embaralhado, COLUNAS_UTI)
+    relatar("transform (ids fora de ordem, groupby)", linhas, tempo_groupby)
+    if referencia:
+        por_coluna = df.copy()
+        _, tempo_ref = cronometrar(transform_por_coluna, por_coluna, COLUNAS_UTI)
+        relatar("transform (groupby por coluna)", linhas, tempo_ref)
+        # O ffill depende da ordem das linhas: a referência fora de ordem usa o mesmo embaralhamento
+        embaralhado_ref = df.sample(frac=1, random_state=0)
+        transform_por_coluna(embaralhado_ref, COLUNAS_UTI)
+        print(f"Resultados iguais: {contiguo.equals(por_coluna) and embaralhado.equals(embaralhado_ref)}")
+        print(f"Aceleração: {tempo_ref / tempo:.1f}x (contíguos), {tempo_ref / tempo_groupby:.1f}x (groupby)")
+
+
+def bench_colunas(linhas, referencia=True):
+    df, novo_nome_colunas, exclusao_colunas = gerar_exportacao_colunas(linhas)
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'exportacao.csv')
+        df.to_csv(caminho, index=False)
+        del df
+        resultado, tempo = cronometrar(colunas_por_esquema, caminho, novo_nome_colunas, exclusao_colunas)
+        relatar("leitura + esquema (usecols, checkboxes)", linhas, tempo)
+        if referencia:
+            resultado_ref, tempo_ref = cronometrar(colunas_por_dataframe, caminho, novo_nome_colunas, exclusao_colunas)
+            relatar("leitura + rename/replace/drop         ", linhas, tempo_ref)
+            print(f"Resultados iguais: {resultado.equals(resultado_ref)}")
+            print(f"Aceleração: {tempo_ref / tempo:.1f}x")
+
+
+def bench_ocupacao(linhas, referencia=True):
+    df = gerar_internamentos(linhas)
+    ocupados, tempo = cronometrar(ocupacao.ocupacao_diaria, df['data_internamento'], df['data_hora_final'],
+                                  df['uti_combined'])
+    relatar("ocupacao_diaria (varredura)", linhas, tempo)
+    # Leitos do cadastro (leitos_uti.json): a junção com as vigências entra no tempo
+    for frequencia in ocupacao.FREQUENCIAS:
+        taxa, tempo_taxa = cronometrar(ocupacao.taxa_ocupacao, ocupados, None, frequencia)
+        print(f"taxa_ocupacao {frequencia}: {len(taxa)} períodos x {taxa.shape[1]} UTIs em {tempo_taxa * 1000:.1f} ms")
+    if referencia:
+        resultado_ref, tempo_ref = cronometrar(ocupacao_por_expansao, df['data_internamento'], df['data_hora_final'],
+                                               df['uti_combined'])
+        relatar("ocupacao_diaria (expansão)", linhas, tempo_ref)
+        resultado_ref = resultado_ref.reindex(index=ocupados.index, columns=ocupados.columns, fill_value=0.0)
+        print(f"Resultados iguais: {np.allclose(ocupados.to_numpy(), resultado_ref.to_numpy())}")
+        print(f"Aceleração: {tempo_ref / tempo:.1f}x")
+
+
+def bench_censo(linhas, referencia=True):
+    hoje = pd.Timestamp.now().floor('min')
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'dados.csv')
+        escrever_exportacao_redcap(caminho, linhas, hoje)
+        completo, tempo = cronometrar(censo.construir_censo, caminho)
+        relatar("construir_censo (exportação completa)", linhas, tempo)
+        # Só as colunas do censo e as chaves dos registros: a exportação inteira não cabe na memória
+        colunas = [*censo.COLUNAS_CENSO, *export.chaves_registro[1:]]
+        exportacao = pd.read_csv(caminho, dtype=str, keep_default_na=False, usecols=colunas)
+
+    # Delta com 1% dos registros, em que os internamentos em aberto recebem alta
+    rng = np.random.default_rng(0)
+    ids = exportacao['id'].unique()
+    delta = exportacao[exportacao['id'].isin(rng.choice(ids, max(1, len(ids) // 100), replace=False))].copy()
+    abertos = (delta['data_internamento'] != '') & (delta['data_hora_obito'] == '') & (delta['data_hora_alta'] == '')
+    delta.loc[abertos, 'data_hora_alta'] = hoje.strftime(censo.FORMATO_DATA)
+    atualizado, tempo_delta = cronometrar(censo.atualizar_censo, json.loads(json.dumps(completo)), delta)
+    relatar("atualizar_censo (delta)", len(delta), tempo_delta)
+    internados = sum(len(pacientes) for pacientes in atualizado['utis'].values())
+    _, tempo_consulta = cronometrar(censo.ocupacao_atual, atualizado, hoje)
+    print(f"ocupacao_atual: {internados} internamentos em aberto em {tempo_consulta * 1000:.1f} ms")
+    if referencia:
+        mesclado = pd.concat([exportacao[~exportacao['id'].isin(delta['id'])], delta], ignore_index=True)
+        inicio = time.perf_counter()
+        recalculado = censo.incluir_internacoes(censo.novo_censo(), censo.internacoes_abertas(mesclado))
+        tempo_ref = time.perf_counter() - inicio
+        relatar("censo recalculado (tabela completa)", len(mesclado), tempo_ref)
+        print(f"Resultados iguais: {atualizado['utis'] == recalculado['utis']}")
+        print(f"Aceleração: {tempo_ref / tempo_delta:.1f}x")
+
+
+def bench_mortalidade(linhas, referencia=True):
+    df = gerar_internamentos(linhas)
+    rng = np.random.default_rng(1)
+    encerrado = df['data_hora_final'].notna()
+    obito = rng.random(linhas) < mortalidade.risco_apache(df['apache'])
+    df['desfecho_uti'] = np.where(encerrado, np.where(obito, 'Óbito', 'Alta'), None)
+    saidas, tempo_saidas = cronometrar(mortalidade.saidas, df)
+    relatar("mortalidade.saidas", linhas, tempo_saidas)
+    tabela, tempo = cronometrar(mortalidade.rmp, saidas)
+    print(f"mortalidade.rmp (todas as UTIs, um groupby): {len(tabela)} UTIs x meses em {tempo:.3f} s")
+    rede, tempo_rede = cronometrar(mortalidade.rmp, saidas, ())
+    print(f"mortalidade.rmp (rede): {len(rede)} meses em {tempo_rede:.3f} s")
+    if referencia:
+        inicio = time.perf_counter()
+        por_uti = pd.concat({uti: mortalidade.rmp(mortalidade.saidas(df[df['uti_combined'] == uti]), ())
+                             for uti in sorted(df['uti_combined'].unique())}, names=['uti'])
+        tempo_ref = time.perf_counter() - inicio
+        print(f"mortalidade.rmp (uma UTI por vez): {len(por_uti)} UTIs x meses em {tempo_ref:.3f} s")
+        print(f"Resultados iguais: {np.allclose(tabela.to_numpy(float), por_uti.to_numpy(float), equal_nan=True)}")
+        print(f"Aceleração: {tempo_ref / (tempo_saidas + tempo):.1f}x")
+
+
+def medir_etapas(tempos):
+    """Retorna um 'medir' para treatment.renomear_colunas_e_salvar que soma os segundos de cada etapa em 'tempos'."""
+    def medir(etapa, funcao, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            tempos[etapa] = tempos.get(etapa, 0.0) + time.perf_counter() - inicio
+    return medir
+
+
+def streamlit_simulado(secao):
+    """Substitui o streamlit em graficos.py: nada é desenhado e a seção escolhida no st.radio é sempre 'secao'."""
+    def nada(*args, **kwargs):
+        return None
+    return SimpleNamespace(title=nada, warning=nada, plotly_chart=nada, radio=lambda *args, **kwargs: secao)
+
+
+def bench_graficos(caminho_dados, uti):
+    """Mede o carregamento da UTI, cada gráfico do registro (sem cache) e cada seção de mostrar_graficos."""
+    arquivos, streamlit = armazenamento.ARQUIVOS_DADOS, graficos.st
+    armazenamento.ARQUIVOS_DADOS = [caminho_dados]
+    tempos, secoes = {}, {}
+    try:
+        carregamento.invalidar_cache()
+        df, tempos['carregamento'] = cronometrar(graficos.dados_uti, uti)
+        cubo, tempos['cubo'] = cronometrar(carregamento.carregar_cubo)
+        for grafico, (funcao, _) in graficos.GRAFICOS.items():
+            _, tempos[grafico] = cronometrar(funcao, df, cubo, uti)
+        # Cada seção a frio, como na primeira visita depois de uma execução do treatment.py
+        for secao in graficos.SECOES:
+            carregamento.invalidar_cache()
+            cache_figuras.limpar()
+            graficos.st = streamlit_simulado(secao)
+            _, secoes[secao] = cronometrar(graficos.mostrar_graficos, uti)
+    finally:
+        armazenamento.ARQUIVOS_DADOS, graficos.st = arquivos, streamlit
+    return {'graficos': tempos, 'secoes': secoes}
+
+
+def bench_escala(linhas, hoje, uti, memoria_mb=None):
+    """Gera a exportação com 'linhas' linhas, executa o tratamento completo e os gráficos, e retorna os tempos."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        entrada = os.path.join(diretorio, 'dados.csv')
+        saida = os.path.join(diretorio, 'data_work.parquet')
+        _, geracao = cronometrar(escrever_exportacao_redcap, entrada, linhas, hoje)
+        etapas = {}
+        _, total = cronometrar(treatment.renomear_colunas_e_salvar, entrada, saida, treatment.COLUNAS_EXCLUIR, None,
+                               hoje, memoria_mb, 1, medir_etapas(etapas))
+        resultado = {'linhas': linhas, 'linhas_tratadas': pq.ParquetFile(saida).metadata.num_rows,
+                     'megabytes_csv': round(os.path.getsize(entrada) / 2 ** 20, 1), 'geracao': geracao,
+                     'tratamento': total, 'etapas': etapas}
+        resultado.update(bench_graficos(saida, uti))
+    return resultado
+
+
+# Grupos de tempos de cada escala, na ordem do relatório
+GRUPOS_TEMPOS = ['etapas', 'graficos', 'secoes']
+
+
+def comparar_resultados(anterior, atual, tolerancia=1.2, minimo=0.01):
+    """Mostra a razão entre os tempos atuais e os de uma execução anterior, nas escalas em comum.
+
+    São marcadas as etapas mais lentas que 'tolerancia' vezes o tempo anterior e por mais de 'minimo' segundos.
+    """
+    if anterior.get('memoria_mb') != atual.get('memoria_mb'):
+        print("Atenção: as execuções usaram modos de memória diferentes (--memoria-mb).")
+    anteriores = {escala['linhas']: escala for escala in anterior['escalas']}
+    for escala in atual['escalas']:
+        base = anteriores.get(escala['linhas'])
+        if base is None:
+            continue
+        print(f"\nComparação com {anterior['data']} ({escala['linhas']} linhas):")
+        for grupo in GRUPOS_TEMPOS:
+            for nome, segundos in escala[grupo].items():
+                antes = base.get(grupo, {}).get(nome)
+                if antes:
+                    aviso = '  <- mais lento' if segundos > max(antes * tolerancia, antes + minimo) else ''
+                    print(f"  {grupo}/{nome}: {antes:.3f} s -> {segundos:.3f} s ({segundos / antes:.2f}x){aviso}")
+
+
+def bench_pipeline(escalas, saida, comparar=None, uti='Ecoville', memoria_mb=None):
+    """Executa o tratamento e os gráficos em cada escala e grava os tempos em JSON em 'saida'."""
+    hoje = pd.Timestamp.now().normalize()
+    resultados = {'data': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                  'pandas': pd.__version__, 'numpy': np.__version__, 'pyarrow': pa.__version__,
+                  'processadores': os.cpu_count(), 'uti': uti, 'memoria_mb': memoria_mb, 'escalas': []}
+    for linhas in escalas:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            escala = bench_escala(linhas, hoje, uti, memoria_mb)
+        resultados['escalas'].append(escala)
+        print(f"\n{linhas} linhas ({escala['megabytes_csv']} MB, {escala['linhas_tratadas']} linhas tratadas): "
+              f"tratamento em {escala['tratamento']:.2f} s")
+        for grupo in GRUPOS_TEMPOS:
+            print(f"  {grupo}: " + ', '.join(f"{nome} {segundos:.3f}" for nome, segundos in escala[grupo].items()))
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {saida}")
+    if comparar:
+        with open(comparar, encoding='utf-8') as arquivo:
+            comparar_resultados(json.load(arquivo), resultados)
+
+
+ETAPAS = {'split': bench_split, 'idade': bench_idade, 'data_final': bench_data_final, 'ffill': bench_ffill,
+          'colunas': bench_colunas, 'ocupacao': bench_ocupacao, 'censo': bench_censo,
+          'mortalidade': bench_mortalidade}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline de tratamento.")
+    parser.add_argument('etapa', choices=[*ETAPAS, 'pipeline'])
+    parser.add_argument('--linhas', type=int, default=500000)
+    parser.add_argument('--sem-referencia', action='store_true',
+                        help="Não executa a implementação anterior (lenta) para comparação.")
+    parser.add_argument('--escalas', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help="pipeline: número de linhas da exportação sintética em cada escala.")
+    parser.add_argument('--saida', default='benchmark_pipeline.json', help="pipeline: arquivo JSON dos resultados.")
+    parser.add_argument('--comparar', help="pipeline: JSON de uma execução anterior para comparar os tempos.")
+    parser.add_argument('--uti', default='Ecoville', help="pipeline: UTI usada nos gráficos.")
+    parser.add_argument('--memoria-mb', type=float, default=None,
+                        help="pipeline: trata a exportação em blocos dentro deste orçamento (ver treatment.py).")
+    args = parser.parse_args()
+
+    if args.etapa == 'pipeline':
+        bench_pipeline(args.escalas, args.saida, args.comparar, args.uti, args.memoria_mb)
+    else:
+        ETAPAS[args.etapa](args.linhas, referencia=not args.sem_referencia)
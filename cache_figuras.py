@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import threading
+from collections import OrderedDict
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Limite de memória das figuras em cache (em MB), compartilhado por todas as sessões do processo
+LIMITE_MB = float(os.getenv('CAPDT_CACHE_FIGURAS_MB', '64'))
+
+# Entradas: chave (UTI, gráfico, versão do dataset) -> (tipo, conteúdo), da menos para a mais recente
+_entradas = OrderedDict()
+_tamanhos = {}
+_estatisticas = {'acertos': 0, 'falhas': 0, 'descartes': 0, 'bytes': 0}
+_trava = threading.Lock()
+
+
+def serializar(resultado):
+    """Converte o resultado de um gráfico em (tipo, conteúdo): figuras são guardadas como JSON."""
+    if isinstance(resultado, go.Figure):
+        return 'figura', resultado.to_json()
+    if isinstance(resultado, str):
+        return 'aviso', resultado
+    return 'vazio', None
+
+
+def desserializar(entrada):
+    """Reconstrói a figura (ou o aviso) a partir da entrada do cache."""
+    tipo, conteudo = entrada
+    if tipo == 'figura':
+        return pio.from_json(conteudo)
+    return conteudo
+
+
+def _descartar_excedente(limite_bytes):
+    # Remove as entradas usadas há mais tempo até caber no limite (chamada com a trava adquirida)
+    while _entradas and _estatisticas['bytes'] > limite_bytes:
+        chave, _ = _entradas.popitem(last=False)
+        _estatisticas['bytes'] -= _tamanhos.pop(chave)
+        _estatisticas['descartes'] += 1
+
+
+def obter(chave, construir):
+    """Retorna o gráfico da chave, construindo-o com `construir()` apenas quando não está em cache.
+
+    As entradas são descartadas por ordem de uso (LRU) quando o total ultrapassa LIMITE_MB.
+    """
+    with _trava:
+        entrada = _entradas.get(chave)
+        if entrada is not None:
+            _entradas.move_to_end(chave)
+            _estatisticas['acertos'] += 1
+        else:
+            _estatisticas['falhas'] += 1
+
+    if entrada is None:
+        # A construção acontece fora da trava para não bloquear as outras sessões
+        entrada = serializar(construir())
+        tamanho = sys.getsizeof(entrada[1])
+        limite_bytes = LIMITE_MB * 1024 * 1024
+        with _trava:
+            if chave not in _entradas and tamanho <= limite_bytes:
+                _entradas[chave] = entrada
+                _tamanhos[chave] = tamanho
+                _estatisticas['bytes'] += tamanho
+                _descartar_excedente(limite_bytes)
+
+    return desserializar(entrada)
+
+
+def estatisticas():
+    """Retorna acertos, falhas, descartes, número de entradas e memória ocupada (MB) do cache."""
+    with _trava:
+        dados = dict(_estatisticas, entradas=len(_entradas))
+    dados['mb'] = dados.pop('bytes') / (1024 * 1024)
+    return dados
+
+
+def limpar():
+    """Esvazia o cache e zera os contadores."""
+    with _trava:
+        _entradas.clear()
+        _tamanhos.clear()
+        _estatisticas.update(acertos=0, falhas=0, descartes=0, bytes=0)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import streamlit as st
+from armazenamento import (localizar_dataset, caminho_cubo, caminho_particoes, caminho_particao, assinatura_arquivo,
+                           ler_dataset, dataset_vazio)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _dataset_em_cache(caminho, colunas):
+    # Uma entrada por arquivo e projeção; a assinatura (mtime, tamanho) da versão lida fica dentro da entrada,
+    # que é relida no lugar quando o arquivo muda, sem acumular cópias de versões anteriores
+    return {'trava': threading.Lock(), 'assinatura': None, 'df': None}
+
+
+def carregar_dataset(caminho=None, colunas=None):
+    """Retorna o DataFrame tratado, compartilhado entre todas as sessões.
+
+    O arquivo só é lido novamente quando sua data de modificação ou tamanho mudam, e a nova versão
+    substitui a anterior no cache (uma entrada por arquivo e conjunto de colunas). Essa assinatura
+    (mtime, tamanho) é a única invalidação: o treatment.py, que roda em outro processo, apenas grava
+    os arquivos. invalidar_cache só serve ao próprio processo (ex.: benchmark.py).
+    Com `colunas`, apenas essas colunas são lidas (projeção nativa em Parquet/Feather).
+    O mesmo objeto é entregue a todos os chamadores, portanto ele não deve ser alterado
+    no lugar (filtre ou use .copy() antes de criar colunas).
+    """
+    caminho = caminho or localizar_dataset()
+    colunas = tuple(colunas) if colunas else None
+    entrada = _dataset_em_cache(caminho, colunas)
+    assinatura = assinatura_arquivo(caminho)
+    with entrada['trava']:
+        if entrada['assinatura'] != assinatura:
+            # A versão anterior é descartada antes da leitura, para não manter duas cópias em memória
+            entrada['assinatura'] = entrada['df'] = None
+            entrada['df'] = ler_dataset(caminho, colunas)
+            entrada['assinatura'] = assinatura
+        return entrada['df']
+
+
+def carregar_particao(uti, caminho=None, colunas=None):
+    """Retorna apenas as linhas da UTI, lendo somente a sua partição.
+
+    Sem partições (arquivo gerado por uma versão anterior do treatment.py), filtra o dataset completo;
+    com partições e sem arquivo para a UTI, a UTI não tem registros e o resultado é vazio, mas com as
+    colunas e os tipos do dataset (datas, códigos e categorias), lidos apenas do esquema do arquivo.
+    """
+    caminho = caminho or localizar_dataset()
+    particao = caminho_particao(uti, caminho)
+    if os.path.exists(particao):
+        return carregar_dataset(particao, colunas)
+    if os.path.isdir(caminho_particoes(caminho)):
+        return dataset_vazio(caminho, colunas)
+    df = carregar_dataset(caminho, colunas)
+    return df[df['uti_combined'] == uti]
+
+
+def carregar_cubo(caminho=None):
+    """Retorna a tabela agregada (uti, mes, metrica, valor) correspondente ao arquivo de dados atual."""
+    return carregar_dataset(caminho_cubo(caminho or localizar_dataset()))
+
+
+def invalidar_cache():
+    """Descarta todos os datasets em cache no processo atual."""
+    _dataset_em_cache.clear()
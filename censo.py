@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import ocupacao
+from colunas import COLUNAS_A_PREENCHER, criar_coluna_mesclada
+
+# Versão do formato do arquivo do censo; um arquivo de outra versão é reconstruído a partir da exportação
+VERSAO_CENSO = 1
+
+# Formato das datas da exportação do REDCap (esquema_redcap.json) e do arquivo do censo
+FORMATO_DATA = '%Y-%m-%d %H:%M'
+
+# Colunas da exportação usadas pelo censo
+COLUNAS_CENSO = ['id', *COLUNAS_A_PREENCHER, 'data_internamento', 'data_hora_obito', 'data_hora_alta']
+
+
+def caminho_censo(caminho_dados):
+    """Retorna o arquivo do censo ao lado da exportação (ex.: dados.csv -> dados_censo.json)."""
+    base, _ = os.path.splitext(caminho_dados)
+    return f"{base}_censo.json"
+
+
+def internacoes_abertas(df):
+    """Retorna 'id', 'uti' e 'data_internamento' dos registros da exportação com internamento em aberto.
+
+    Em aberto é a linha principal do registro com data de internamento e sem data de óbito ou de alta,
+    o mesmo critério do treatment.py (preencher_data_hora_final). Aceita a exportação lida como texto
+    (export.py), em que valores vazios são ''.
+    """
+    linhas = df[[coluna for coluna in COLUNAS_CENSO if coluna in df.columns]].replace('', np.nan)
+    for coluna in COLUNAS_CENSO:
+        if coluna not in linhas.columns:
+            linhas[coluna] = np.nan
+    abertas = linhas[linhas['data_internamento'].notna() & linhas['data_hora_obito'].isna()
+                     & linhas['data_hora_alta'].isna()].copy()
+    criar_coluna_mesclada(abertas, COLUNAS_A_PREENCHER, 'uti')
+    abertas['data_internamento'] = pd.to_datetime(abertas['data_internamento'], format=FORMATO_DATA, errors='coerce')
+    abertas = abertas[abertas['data_internamento'].notna()]
+    return pd.DataFrame({'id': abertas['id'].astype(str), 'uti': abertas['uti'].fillna('Outros'),
+                         'data_internamento': abertas['data_internamento']}).reset_index(drop=True)
+
+
+def novo_censo():
+    """Cria um censo vazio: {'utis': {uti: {id: data de internamento}}}."""
+    return {'versao': VERSAO_CENSO, 'atualizado_em': None, 'utis': {}}
+
+
+def incluir_internacoes(censo, abertas):
+    """Acrescenta ao censo os internamentos em aberto (DataFrame de internacoes_abertas)."""
+    datas = abertas['data_internamento'].dt.strftime(FORMATO_DATA)
+    for (uti, id_registro), data in zip(zip(abertas['uti'], abertas['id']), datas):
+        censo['utis'].setdefault(uti, {})[id_registro] = data
+    censo['atualizado_em'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return censo
+
+
+def construir_censo(caminho_dados):
+    """Monta o censo lendo da exportação completa apenas as colunas de UTI e datas, como texto (pyarrow)."""
+    tabela = pacsv.read_csv(
+        caminho_dados,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=COLUNAS_CENSO, include_missing_columns=True,
+            column_types={coluna: pa.string() for coluna in COLUNAS_CENSO}, strings_can_be_null=True))
+    return incluir_internacoes(novo_censo(), internacoes_abertas(tabela.to_pandas()))
+
+
+def atualizar_censo(censo, delta):
+    """Aplica ao censo o delta da exportação incremental, sem reler o histórico.
+
+    O REDCap devolve os registros alterados por inteiro: cada 'id' do delta sai do censo e volta apenas se
+    o internamento continua em aberto (talvez em outra UTI). O custo depende do tamanho do delta, não do
+    histórico. Registros apagados no REDCap não aparecem no delta e só saem na próxima exportação completa.
+    """
+    if delta.empty:
+        return censo
+    alterados = set(delta['id'].astype(str))
+    for internados in censo['utis'].values():
+        for id_registro in alterados.intersection(internados):
+            del internados[id_registro]
+    censo['utis'] = {uti: internados for uti, internados in censo['utis'].items() if internados}
+    return incluir_internacoes(censo, internacoes_abertas(delta))
+
+
+def carregar_censo(caminho):
+    """Lê o arquivo do censo, ou None se ele não existir ou for de outra versão."""
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as arquivo:
+        censo = json.load(arquivo)
+    return censo if censo.get('versao') == VERSAO_CENSO else None
+
+
+def salvar_censo(censo, caminho):
+    """Grava o censo em um arquivo temporário e o renomeia, para o painel nunca ler um arquivo pela metade."""
+    caminho_temp = caminho + '.tmp'
+    with open(caminho_temp, 'w', encoding='utf-8') as arquivo:
+        json.dump(censo, arquivo, ensure_ascii=False)
+    os.replace(caminho_temp, caminho)
+
+
+def reconstruir_censo(caminho_dados):
+    """Monta o censo a partir da exportação completa e o grava ao lado dela. Retorna o censo."""
+    censo = construir_censo(caminho_dados)
+    salvar_censo(censo, caminho_censo(caminho_dados))
+    return censo
+
+
+def sincronizar_censo(delta, caminho_dados):
+    """Aplica o delta ao censo gravado ao lado da exportação (já mesclada); sem censo, monta-o. Retorna o censo."""
+    censo = carregar_censo(caminho_censo(caminho_dados))
+    if censo is None:
+        return reconstruir_censo(caminho_dados)
+    censo = atualizar_censo(censo, delta)
+    salvar_censo(censo, caminho_censo(caminho_dados))
+    return censo
+
+
+def pacientes_internados(censo, uti, agora=None):
+    """Internamentos em aberto da UTI, do mais longo ao mais recente, com os dias de permanência até 'agora'."""
+    agora = pd.Timestamp(agora) if agora is not None else pd.Timestamp.now()
+    internados = censo['utis'].get(uti, {})
+    datas = pd.to_datetime(pd.Series(list(internados.values()), dtype=object), format=FORMATO_DATA)
+    pacientes = pd.DataFrame({'id': list(internados), 'data_internamento': datas,
+                              'dias_internado': (agora - datas) / pd.Timedelta(days=1)})
+    return pacientes.sort_values('data_internamento', ignore_index=True)
+
+
+def ocupacao_atual(censo, agora=None, leitos=None):
+    """Pacientes internados, leitos, taxa de ocupação (%) e permanência (dias) por UTI, em 'agora'.
+
+    Percorre apenas os internamentos em aberto. Os leitos são os da vigência em 'agora' no cadastro
+    (ocupacao.carregar_leitos, o padrão) ou um número fixo por UTI (dict ou Series).
+    """
+    agora = pd.Timestamp(agora) if agora is not None else pd.Timestamp.now()
+    utis = [uti for uti, internados in censo['utis'].items() for _ in internados]
+    datas = [data for internados in censo['utis'].values() for data in internados.values()]
+    dias = (agora - pd.to_datetime(pd.Series(datas, dtype=object), format=FORMATO_DATA)) / pd.Timedelta(days=1)
+    grupos = dias.groupby(pd.Series(utis, dtype=object).rename('uti'))
+    atual = pd.DataFrame({'internados': grupos.size(), 'permanencia_media_dias': grupos.mean(),
+                          'maior_permanencia_dias': grupos.max()}).reset_index()
+    atual.insert(2, 'leitos', atual['uti'].map(leitos_em(agora, leitos)))
+    atual.insert(3, 'taxa_ocupacao', atual['internados'] / atual['leitos'].where(atual['leitos'] > 0) * 100)
+    return atual
+
+
+def leitos_em(data, leitos=None):
+    """Leitos de cada UTI na vigência que inclui 'data' (Series indexada pela UTI)."""
+    if leitos is None:
+        leitos = ocupacao.carregar_leitos()
+    elif not isinstance(leitos, pd.DataFrame):
+        leitos = ocupacao.vigencias_fixas(leitos)
+    vigentes = ((leitos['inicio'].isna() | (leitos['inicio'] <= data))
+                & (leitos['fim'].isna() | (leitos['fim'] > data)))
+    return leitos[vigentes].set_index('uti')['leitos'].astype(float)
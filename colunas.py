@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+# Colunas de UTI da exportação, preenchidas por 'id' e mescladas em 'uti_combined'
+COLUNAS_A_PREENCHER = ['uti_inc', 'uti_vita', 'uti_santa_casa', 'uti_im', 'uti_nacoes', 'uti_sao_rafael', 'uti_hr',
+                       'uti_hsl']
+
+
+def criar_coluna_mesclada(df, columns_to_merge, new_column_name, separador='|'):
+    """Cria uma nova coluna mesclando valores de outras colunas, operando sobre colunas inteiras.
+
+    Cada linha recebe o primeiro valor não nulo entre as colunas, mantendo o tipo do resultado
+    (datas continuam datas, números continuam números). Em colunas de texto, linhas com mais de
+    um valor preenchido recebem todos os valores unidos por 'separador', como na versão por linhas.
+    """
+    colunas = df[columns_to_merge]
+    preenchidas = colunas.notna()
+
+    # Primeiro valor não nulo, coluna a coluna
+    resultado = colunas[columns_to_merge[0]]
+    for coluna in columns_to_merge[1:]:
+        resultado = resultado.where(resultado.notna(), colunas[coluna])
+
+    multiplos = preenchidas.sum(axis=1) > 1
+    if resultado.dtype == object and multiplos.any():
+        # Junta os valores preenchidos apenas nas linhas com mais de um valor
+        unidos = pd.Series('', index=resultado.index[multiplos])
+        for coluna in columns_to_merge:
+            valor = colunas.loc[multiplos, coluna]
+            texto = valor.astype(str)
+            unidos = unidos.where(valor.isna(), unidos.where(unidos == '', unidos + separador) + texto)
+        resultado = resultado.where(~multiplos, unidos)
+
+    if pd.api.types.infer_dtype(resultado, skipna=True) == 'string':
+        resultado = resultado.str.strip()
+
+    df[new_column_name] = resultado
@@ -1,17 +1,44 @@
 import os
+import argparse
+import csv
+import shutil
+import tempfile
+import time
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from io import StringIO
+import pandas as pd
 from dotenv import load_dotenv
+from instrumentacao import executar, iniciar_execucao, medidor, anotar, finalizar_execucao
+from censo import reconstruir_censo, sincronizar_censo
 
 load_dotenv()
 
-token = os.getenv('API_TOKEN')
-url = 'https://cepetiredcap.com.br/api/'
-if not token:
-    raise ValueError("Token da API não encontrado nas variáveis de ambiente.")
+# A URL pode ser trocada (ex.: servidor REDCap local de testes) pela variável REDCAP_URL
+url = os.getenv('REDCAP_URL', 'https://cepetiredcap.com.br/api/')
+
+# Armazenamento local da exportação e estado da sincronização incremental
+arquivo_dados = 'dados.csv'
+arquivo_estado = 'export_estado.json'
+
+# Chaves que identificam uma linha da exportação (registro + instância de instrumento repetido)
+chaves_registro = ['id', 'redcap_repeat_instrument', 'redcap_repeat_instance']
+
+# Margem de segurança na marca d'água, para cobrir diferenças de relógio com o servidor
+margem_sincronizacao = timedelta(minutes=10)
+
+# Exportação em lotes: registros por requisição, requisições simultâneas e tentativas por requisição
+tamanho_lote_padrao = 500
+workers_padrao = 4
+tentativas_lote = 4
+espera_base = 2
+
+# Tamanho dos blocos lidos da resposta no download em streaming (1 MB)
+tamanho_bloco = 1024 * 1024
 
 data = {
-    'token': token,
     'content': 'record',
     'format': 'csv',
     'type': 'flat',
@@ -30,38 +57,424 @@ data = {
     'returnFormat': 'json'
 }
 
-try:
-    # Solicitação à API
-    response = requests.post(url, data=data, timeout=200)
+
+def obter_token():
+    token = os.getenv('API_TOKEN')
+    if not token:
+        raise ValueError("Token da API não encontrado nas variáveis de ambiente.")
+    return token
+
+
+def registrar_erro(conteudo):
+    with open('erro.json', 'w', encoding='utf-8') as jsonfile:
+        json.dump(conteudo, jsonfile, ensure_ascii=False)
+
+
+def solicitar_exportacao(token, stream=False, **parametros):
+    """Faz a solicitação à API e retorna a resposta, ou None (com 'erro.json' gravado) em caso de falha.
+
+    Com stream=True o corpo não é lido; use gravar_resposta() para salvá-lo em disco por partes.
+    """
+    response = requests.post(url, data=dict(data, token=token, **parametros), timeout=200, stream=stream)
 
     print('HTTP Status:', response.status_code)
 
+    # O REDCap exporta sempre em UTF-8, mesmo quando o cabeçalho não informa o charset
+    response.encoding = 'utf-8'
+
     if response.status_code == 403:
         error_message = json.loads(response.text).get('error', '')
         print(f'Erro de permissão: {error_message}')
+        registrar_erro({'error': 'Erro de permissão', 'message': error_message})
+        return None
+
+    elif response.status_code != 200:
+        print('Falha na solicitação à API. Código de status HTTP:', response.status_code)
+        registrar_erro({'error': 'Falha na solicitação à API', 'status_code': response.status_code,
+                        'message': response.text})
+        return None
+
+    return response
+
+
+def carregar_estado():
+    if not os.path.exists(arquivo_estado):
+        return {}
+    with open(arquivo_estado, 'r', encoding='utf-8') as jsonfile:
+        return json.load(jsonfile)
+
+
+def salvar_estado(estado):
+    with open(arquivo_estado, 'w', encoding='utf-8') as jsonfile:
+        json.dump(estado, jsonfile, ensure_ascii=False, indent=2)
+
+
+def ler_csv_texto(texto):
+    """Lê a exportação mantendo todos os valores como texto ('' nos campos vazios)."""
+    if not texto.strip():
+        return pd.DataFrame()
+    return pd.read_csv(StringIO(texto), dtype=str, keep_default_na=False)
+
+
+def ler_csv_arquivo(caminho):
+    """Lê um CSV da exportação gravado em disco, como ler_csv_texto (vazio quando não há registros)."""
+    try:
+        return pd.read_csv(caminho, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+def gravar_resposta(response, destino):
+    """Grava o corpo da resposta em 'destino' por blocos, sem manter o CSV inteiro em memória.
+
+    O conteúdo vai para um arquivo temporário que recebe fsync e só então substitui o destino;
+    um download interrompido nunca sobrescreve um arquivo bom. Retorna o número de bytes gravados.
+    """
+    caminho_temp = destino + '.tmp'
+    total = 0
+    try:
+        with open(caminho_temp, 'wb') as arquivo:
+            for bloco in response.iter_content(chunk_size=tamanho_bloco):
+                arquivo.write(bloco)
+                total += len(bloco)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+    except BaseException:
+        if os.path.exists(caminho_temp):
+            os.remove(caminho_temp)
+        raise
+    finally:
+        response.close()
+    os.replace(caminho_temp, destino)
+    return total
+
+
+def relatar_download(total, inicio):
+    segundos = max(time.perf_counter() - inicio, 1e-9)
+    print(f'{total / 1e6:.1f} MB recebidos em {segundos:.1f} s ({total / 1e6 / segundos:.2f} MB/s).')
+
+
+def ler_registros_csv(arquivo):
+    """Percorre um CSV aberto em modo texto (newline='') e retorna (campos, texto original) de cada registro.
+
+    O texto original inclui as quebras de linha dentro de valores entre aspas, de modo que o registro
+    pode ser regravado exatamente como estava. Linhas em branco são ignoradas.
+    """
+    linhas = []
+
+    def fonte():
+        for linha in arquivo:
+            linhas.append(linha)
+            yield linha
+
+    for campos in csv.reader(fonte()):
+        texto = ''.join(linhas)
+        linhas.clear()
+        if campos:
+            yield campos, texto
+
+
+def linha_csv(valores):
+    """Formata uma linha de CSV como o pandas (aspas só quando necessárias, '\\n' no final)."""
+    linha = StringIO()
+    csv.writer(linha, lineterminator='\n').writerow(valores)
+    return linha.getvalue()
+
+
+def mesclar_registros(delta, caminho):
+    """Substitui no arquivo local 'caminho' todos os registros presentes no delta (CSV aberto em modo texto).
+
+    Cada registro alterado é trocado por inteiro (incluindo as instâncias repetidas), de modo
+    que instâncias removidas no REDCap também saiam do arquivo local. Registros existentes
+    mantêm sua posição e registros novos entram no final. O arquivo local é percorrido registro a
+    registro e as linhas dos registros fora do delta são copiadas sem alteração; só o delta fica em
+    memória. Se o delta trouxer colunas novas, elas entram no final e as demais linhas são regravadas
+    com os campos vazios. Como em juntar_lotes, o resultado recebe fsync antes de substituir o arquivo.
+    Retorna o número de registros do delta.
+    """
+    registros_delta = ler_registros_csv(delta)
+    cabecalho_delta, _ = next(registros_delta, ([], ''))
+    caminho_temp = caminho + '.tmp'
+    with open(caminho, encoding='utf-8', newline='') as entrada, \
+            open(caminho_temp, 'w', encoding='utf-8', newline='') as saida:
+        registros = ler_registros_csv(entrada)
+        cabecalho, texto_cabecalho = next(registros, ([], ''))
+        colunas = cabecalho + [coluna for coluna in cabecalho_delta if coluna not in cabecalho]
+
+        def formatar(origem, campos, texto):
+            # Registros com as mesmas colunas do resultado mantêm o texto original
+            if origem == colunas:
+                return texto
+            valores = dict(zip(origem, campos))
+            return linha_csv([valores.get(coluna, '') for coluna in colunas])
+
+        # Linhas do delta por registro, na ordem em que chegaram
+        alterados = {}
+        for campos, texto in registros_delta:
+            id_registro = campos[cabecalho_delta.index('id')]
+            alterados.setdefault(id_registro, []).append(formatar(cabecalho_delta, campos, texto))
+        total = len(alterados)
+
+        sem_quebra = False
+
+        def escrever(texto):
+            # Um último registro sem quebra de linha recebe uma antes do próximo
+            nonlocal sem_quebra
+            if sem_quebra:
+                saida.write('\n')
+            saida.write(texto)
+            sem_quebra = not texto.endswith('\n')
 
-        with open('erro.json', 'w', encoding='utf-8') as jsonfile:
-            json.dump({'error': 'Erro de permissão', 'message': error_message}, jsonfile, ensure_ascii=False)
-        exit()
+        escrever(texto_cabecalho if colunas == cabecalho else linha_csv(colunas))
+        substituidos = set()
+        posicao_id = cabecalho.index('id') if cabecalho else None
+        for campos, texto in registros:
+            id_registro = campos[posicao_id]
+            if id_registro in alterados:
+                # O registro alterado entra na posição da sua primeira linha; as demais são descartadas
+                for linha in alterados.pop(id_registro):
+                    escrever(linha)
+                substituidos.add(id_registro)
+            elif id_registro not in substituidos:
+                escrever(formatar(cabecalho, campos, texto))
+        for linhas in alterados.values():
+            for linha in linhas:
+                escrever(linha)
+        saida.flush()
+        os.fsync(saida.fileno())
+    os.replace(caminho_temp, caminho)
+    return total
 
-    elif response.status_code == 200:
-        with open('dados.csv', 'w', newline='', encoding='utf-8') as csvfile:
-            csvfile.write(response.text)
-        print('Dados salvos com sucesso em "dados.csv".')
 
+def criar_sessao(workers):
+    """Cria uma sessão HTTP com um pool de conexões do tamanho do número de workers."""
+    sessao = requests.Session()
+    adaptador = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    return sessao
+
+
+def postar_com_tentativas(sessao, parametros, descricao, destino=None):
+    """Envia a requisição repetindo em erros temporários (conexão, timeout, 429 e 5xx) com espera crescente.
+
+    Com 'destino', a resposta é gravada em disco em streaming (uma queda no meio do download
+    também é repetida) e o número de bytes gravados é retornado no lugar da resposta.
+    """
+    for tentativa in range(tentativas_lote):
+        try:
+            response = sessao.post(url, data=parametros, timeout=200, stream=destino is not None)
+            response.raise_for_status()
+            response.encoding = 'utf-8'
+            if destino is None:
+                return response
+            return gravar_resposta(response, destino)
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError) as erro:
+            falha = erro
+        except requests.exceptions.HTTPError as erro:
+            # Só 429 e 5xx são temporários; os demais erros (ex.: 403) interrompem a exportação
+            if erro.response.status_code != 429 and erro.response.status_code < 500:
+                raise
+            falha = erro
+
+        if tentativa == tentativas_lote - 1:
+            raise falha
+        print(f'{descricao} falhou ({falha}). Nova tentativa em {espera_base * 2 ** tentativa} s.')
+        time.sleep(espera_base * 2 ** tentativa)
+
+
+def listar_registros(sessao, token):
+    """Retorna os ids dos registros do projeto, na ordem em que o REDCap os exporta."""
+    parametros = {'token': token, 'content': 'record', 'format': 'csv', 'type': 'flat',
+                  'fields[0]': 'id', 'returnFormat': 'json'}
+    response = postar_com_tentativas(sessao, parametros, 'Listagem de registros')
+    return list(pd.unique(ler_csv_texto(response.text).get('id', pd.Series(dtype=str))))
+
+
+def baixar_lote(sessao, token, ids, destino):
+    """Exporta um lote de registros para 'destino' em streaming e retorna os bytes gravados."""
+    parametros = dict(data, token=token)
+    parametros.update({f'records[{i}]': id_registro for i, id_registro in enumerate(ids)})
+    return postar_com_tentativas(sessao, parametros, f'Lote de {len(ids)} registros', destino)
+
+
+def juntar_lotes(partes, caminho):
+    """Concatena os CSVs dos lotes (mantendo só o primeiro cabeçalho) e substitui o arquivo de forma atômica."""
+    caminho_temp = caminho + '.tmp'
+    cabecalho_gravado = False
+    with open(caminho_temp, 'wb') as saida:
+        for parte in partes:
+            with open(parte, 'rb') as entrada:
+                cabecalho = entrada.readline()
+                if not entrada.peek(1):
+                    continue  # Lote sem linhas de dados
+                if not cabecalho_gravado:
+                    saida.write(cabecalho)
+                    cabecalho_gravado = True
+                shutil.copyfileobj(entrada, saida)
+        saida.flush()
+        os.fsync(saida.fileno())
+    os.replace(caminho_temp, caminho)
+
+
+def baixar_lotes(sessao, token, lotes, destinos, workers):
+    """Baixa cada lote de ids para o seu destino, com 'workers' requisições simultâneas. Retorna o total de bytes."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(lambda args: baixar_lote(sessao, token, *args), zip(lotes, destinos)))
+
+
+def exportar_em_lotes(token, tamanho_lote=tamanho_lote_padrao, workers=workers_padrao, medir=executar):
+    """Exporta todos os registros em lotes paralelos e gera o mesmo 'dados.csv' da exportação única.
+
+    Os ids são listados primeiro; cada lote é gravado em disco assim que chega e os arquivos
+    são concatenados na ordem original dos registros.
+    """
+    inicio = datetime.now()
+    inicio_download = time.perf_counter()
+    sessao = criar_sessao(workers)
+    ids = medir('listagem', listar_registros, sessao, token)
+    lotes = [ids[i:i + tamanho_lote] for i in range(0, len(ids), tamanho_lote)]
+    print(f'{len(ids)} registros em {len(lotes)} lote(s) de até {tamanho_lote}, com {workers} worker(s).')
+
+    pasta_temp = tempfile.mkdtemp(prefix='export_', dir=os.path.dirname(os.path.abspath(arquivo_dados)))
+    try:
+        destinos = [os.path.join(pasta_temp, f'lote_{i:05d}.csv') for i in range(len(lotes))]
+        total = medir('download', baixar_lotes, sessao, token, lotes, destinos, workers)
+        medir('juntar', juntar_lotes, destinos, arquivo_dados)
+    finally:
+        shutil.rmtree(pasta_temp, ignore_errors=True)
+        sessao.close()
+
+    relatar_download(total, inicio_download)
+    salvar_estado({'ultima_sincronizacao': (inicio - margem_sincronizacao).strftime('%Y-%m-%d %H:%M:%S'),
+                   'modo': 'completo'})
+    print(f'Dados salvos com sucesso em "{arquivo_dados}".')
+    return True
+
+
+def exportar_completo(token, tamanho_lote=tamanho_lote_padrao, workers=workers_padrao, medir=executar):
+    """Exporta todos os registros e substitui o arquivo local (em lotes quando tamanho_lote > 0).
+
+    O censo dos internamentos em aberto (censo.py) é montado novamente a partir do arquivo completo.
+    """
+    if tamanho_lote > 0:
+        sucesso = exportar_em_lotes(token, tamanho_lote, workers, medir)
     else:
-        print('Falha na solicitação à API. Código de status HTTP:', response.status_code)
-        with open('erro.json', 'w', encoding='utf-8') as jsonfile:
-            json.dump(
-                {'error': 'Falha na solicitação à API', 'status_code': response.status_code, 'message': response.text},
-                jsonfile, ensure_ascii=False)
+        sucesso = exportar_requisicao_unica(token, medir)
+    if sucesso:
+        medir('censo', reconstruir_censo, arquivo_dados)
+    return sucesso
 
-except requests.exceptions.Timeout:
-    print('Ocorreu um timeout na solicitação.')
-    with open('erro.json', 'w', encoding='utf-8') as jsonfile:
-        json.dump({'error': 'Timeout', 'message': 'A solicitação excedeu o tempo limite'}, jsonfile, ensure_ascii=False)
 
-except requests.exceptions.RequestException as e:
-    print(f'Ocorreu um erro de conexão: {e}')
-    with open('erro.json', 'w', encoding='utf-8') as jsonfile:
-        json.dump({'error': 'Erro de conexão', 'message': str(e)}, jsonfile, ensure_ascii=False)
+def exportar_requisicao_unica(token, medir=executar):
+    """Exporta todos os registros em uma única requisição e substitui o arquivo local."""
+    inicio = datetime.now()
+    inicio_download = time.perf_counter()
+    response = medir('requisicao', solicitar_exportacao, token, stream=True)
+    if response is None:
+        return False
+
+    # Grava em streaming: o CSV nunca é mantido inteiro em memória
+    relatar_download(medir('download', gravar_resposta, response, arquivo_dados), inicio_download)
+
+    salvar_estado({'ultima_sincronizacao': (inicio - margem_sincronizacao).strftime('%Y-%m-%d %H:%M:%S'),
+                   'modo': 'completo'})
+    print(f'Dados salvos com sucesso em "{arquivo_dados}".')
+    return True
+
+
+def modo_exportacao(completo=False):
+    """Retorna o modo que a exportação executa ('completo' ou 'incremental').
+
+    A incremental exige uma sincronização anterior e o arquivo local; sem eles, ou com 'completo', é a completa.
+    """
+    if completo or not carregar_estado().get('ultima_sincronizacao') or not os.path.exists(arquivo_dados):
+        return 'completo'
+    return 'incremental'
+
+
+def exportar_incremental(token, tamanho_lote=tamanho_lote_padrao, workers=workers_padrao, medir=executar):
+    """Exporta apenas os registros alterados desde a última sincronização e mescla no arquivo local.
+
+    Sem estado anterior (ou sem arquivo local) faz uma exportação completa. O censo dos internamentos
+    em aberto é atualizado apenas com os registros do delta.
+    """
+    if modo_exportacao() == 'completo':
+        print('Nenhuma sincronização anterior encontrada. Fazendo exportação completa.')
+        return exportar_completo(token, tamanho_lote, workers, medir)
+    marca = carregar_estado()['ultima_sincronizacao']
+
+    inicio = datetime.now()
+    response = medir('requisicao', solicitar_exportacao, token, stream=True, dateRangeBegin=marca)
+    if response is None:
+        return False
+
+    # O delta também é gravado em streaming (com fsync) e mesclado a partir do disco: nem ele nem o
+    # arquivo local passam inteiros pela memória
+    caminho_delta = arquivo_dados + '.delta'
+    try:
+        medir('download', gravar_resposta, response, caminho_delta)
+        delta = medir('leitura_delta', ler_csv_arquivo, caminho_delta)
+        if not delta.empty:
+            # Registro a registro: as linhas dos registros que não mudaram são mantidas byte a byte
+            with open(caminho_delta, encoding='utf-8', newline='') as arquivo:
+                medir('mesclagem', mesclar_registros, arquivo, arquivo_dados)
+    finally:
+        if os.path.exists(caminho_delta):
+            os.remove(caminho_delta)
+    medir('censo', sincronizar_censo, delta, arquivo_dados)
+
+    registros = delta['id'].nunique() if not delta.empty else 0
+    salvar_estado({'ultima_sincronizacao': (inicio - margem_sincronizacao).strftime('%Y-%m-%d %H:%M:%S'),
+                   'modo': 'incremental', 'registros_atualizados': int(registros)})
+    print(f'{registros} registro(s) alterado(s) desde {marca} mesclado(s) em "{arquivo_dados}".')
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta os dados do REDCap para 'dados.csv'.")
+    parser.add_argument('--completo', action='store_true',
+                        help="Ignora a sincronização incremental e exporta todos os registros.")
+    parser.add_argument('--lote', type=int, default=tamanho_lote_padrao,
+                        help="Registros por requisição na exportação completa (0 = uma única requisição).")
+    parser.add_argument('--workers', type=int, default=workers_padrao,
+                        help="Número de requisições simultâneas na exportação em lotes.")
+    args = parser.parse_args()
+
+    token = obter_token()
+
+    # Tempo, CPU, memória e linhas de cada etapa vão para 'dados_execucao.json' e o histórico 'dados_execucoes.jsonl'
+    execucao = iniciar_execucao('export', completo=args.completo, lote=args.lote, workers=args.workers)
+    medir = medidor(execucao)
+    # Modo escolhido antes da exportação (a incremental sem estado anterior vira completa): é o que vai para o
+    # relatório também quando a execução falha, e não o modo da última execução bem-sucedida
+    modo = modo_exportacao(args.completo)
+    erro = None
+    try:
+        if args.completo:
+            sucesso = exportar_completo(token, args.lote, args.workers, medir)
+        else:
+            sucesso = exportar_incremental(token, args.lote, args.workers, medir)
+        if not sucesso:
+            erro = RuntimeError('Falha na solicitação à API (detalhes em erro.json)')
+
+    except requests.exceptions.Timeout as e:
+        erro = e
+        print('Ocorreu um timeout na solicitação.')
+        registrar_erro({'error': 'Timeout', 'message': 'A solicitação excedeu o tempo limite'})
+
+    except requests.exceptions.RequestException as e:
+        erro = e
+        print(f'Ocorreu um erro de conexão: {e}')
+        registrar_erro({'error': 'Erro de conexão', 'message': str(e)})
+
+    except Exception as e:
+        erro = e
+        raise
+
+    finally:
+        if os.path.exists(arquivo_dados):
+            anotar(execucao, bytes_dados=os.path.getsize(arquivo_dados))
+        finalizar_execucao(execucao, arquivo_dados, modo, erro)
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, o pico de memória não é registrado
+    resource = None
+
+# Quantas execuções anteriores (do mesmo modo) formam a referência da comparação de tendência
+EXECUCOES_REFERENCIA = 10
+
+# Execuções mantidas no histórico; acima disso, as mais antigas são descartadas
+MAXIMO_HISTORICO = 1000
+
+# Etapas mais lentas que esta razão sobre a mediana das execuções anteriores são destacadas no resumo
+LIMITE_LENTIDAO = 1.5
+
+# Intervalo (em segundos) entre as leituras da memória residente durante uma etapa
+INTERVALO_AMOSTRAS = 0.01
+
+# ru_maxrss é informado em KB no Linux e em bytes no macOS
+_DIVISOR_RSS = 2 ** 20 if sys.platform == 'darwin' else 2 ** 10
+
+# Memória residente atual em /proc/self/statm (em páginas), disponível apenas no Linux
+_STATM = '/proc/self/statm'
+_PAGINA = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def executar(etapa, funcao, *args, **kwargs):
+    """Executa uma etapa sem medição: o 'medir' padrão de quem aceita um (ver medidor)."""
+    return funcao(*args, **kwargs)
+
+
+def pico_rss_mb(quem=None):
+    """Maior memória residente (MB) do processo atual até agora, ou dos processos filhos já encerrados."""
+    if resource is None:
+        return None
+    quem = resource.RUSAGE_SELF if quem is None else quem
+    return resource.getrusage(quem).ru_maxrss / _DIVISOR_RSS
+
+
+def rss_atual_mb():
+    """Memória residente (MB) do processo neste momento, ou None onde /proc/self/statm não existe."""
+    try:
+        with open(_STATM) as arquivo:
+            return int(arquivo.read().split()[1]) * _PAGINA / 2 ** 20
+    except OSError:
+        return None
+
+
+def _amostrar_rss(parar, pico):
+    # Guarda em pico[0] a maior memória residente lida até 'parar' ser sinalizado
+    while not parar.wait(INTERVALO_AMOSTRAS):
+        pico[0] = max(pico[0], rss_atual_mb() or 0)
+
+
+def pico_da_etapa(funcao, *args, **kwargs):
+    """Executa a função e retorna (resultado, memória residente no início em MB, pico durante a execução em MB).
+
+    O pico é o maior valor lido de /proc/self/statm a cada INTERVALO_AMOSTRAS por uma thread, no início e no
+    fim; se a execução elevou o pico do processo (ru_maxrss), esse valor exato é usado. Onde /proc não existe,
+    início e pico são None: ru_maxrss sozinho é o pico do processo inteiro, não o da etapa.
+    """
+    inicio = rss_atual_mb()
+    if inicio is None:
+        return funcao(*args, **kwargs), None, None
+    pico_processo = pico_rss_mb()
+    pico = [inicio]
+    parar = threading.Event()
+    amostrador = threading.Thread(target=_amostrar_rss, args=(parar, pico), daemon=True)
+    amostrador.start()
+    try:
+        resultado = funcao(*args, **kwargs)
+    finally:
+        parar.set()
+        amostrador.join()
+    pico, pico_processo_depois = max(pico[0], rss_atual_mb() or 0), pico_rss_mb()
+    if pico_processo is not None and pico_processo_depois > pico_processo:
+        pico = max(pico, pico_processo_depois)
+    return resultado, inicio, pico
+
+
+def _linhas(valor, tipos=pd.DataFrame):
+    # Linhas de um DataFrame, também quando ele é o primeiro item de uma tupla (ex.: (df, motor))
+    if isinstance(valor, tuple) and valor:
+        valor = valor[0]
+    return len(valor) if isinstance(valor, tipos) else None
+
+
+def iniciar_execucao(programa, **parametros):
+    """Cria o registro de uma execução: etapas medidas, parâmetros e os relógios de início."""
+    return {
+        'programa': programa,
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'parametros': parametros,
+        'etapas': {},
+        'relogios': (time.perf_counter(), time.process_time()),
+    }
+
+
+def medidor(execucao):
+    """Retorna um 'medir(etapa, funcao, *args, **kwargs)' que executa a etapa e registra a medição em 'execucao'.
+
+    Cada etapa guarda o tempo de relógio e de CPU, o pico de memória residente durante a etapa e quanto esse
+    pico ficou acima da memória do início da etapa (pico_da_etapa), e as linhas do primeiro DataFrame recebido
+    e do retornado (ou do recebido, nas etapas que alteram o DataFrame no lugar). Chamadas repetidas da mesma
+    etapa (um bloco por vez) somam tempos e linhas; o pico e o aumento são os maiores entre as chamadas.
+    """
+    def medir(etapa, funcao, *args, **kwargs):
+        entrada = next((linhas for linhas in map(_linhas, args) if linhas is not None), None)
+        relogio, cpu = time.perf_counter(), time.process_time()
+        resultado, rss_inicio, pico = pico_da_etapa(funcao, *args, **kwargs)
+        medicao = execucao['etapas'].setdefault(etapa, {
+            'chamadas': 0, 'segundos': 0.0, 'cpu_segundos': 0.0, 'pico_rss_mb': None, 'aumento_pico_mb': None,
+            'linhas_entrada': None, 'linhas_saida': None})
+        medicao['chamadas'] += 1
+        medicao['segundos'] += time.perf_counter() - relogio
+        medicao['cpu_segundos'] += time.process_time() - cpu
+        if pico is not None:
+            medicao['pico_rss_mb'] = max(medicao['pico_rss_mb'] or 0, pico)
+            medicao['aumento_pico_mb'] = max(medicao['aumento_pico_mb'] or 0, pico - rss_inicio)
+        # Na saída também contam os itens de uma lista (ex.: ids listados na exportação)
+        saida = _linhas(resultado, (pd.DataFrame, list))
+        if saida is None and resultado is None and args:
+            saida = _linhas(args[0])
+        for chave, linhas in (('linhas_entrada', entrada), ('linhas_saida', saida)):
+            if linhas is not None:
+                medicao[chave] = (medicao[chave] or 0) + linhas
+        return resultado
+    return medir
+
+
+def anotar(execucao, **valores):
+    """Acrescenta valores ao relatório da execução (ex.: bytes baixados, registros exportados)."""
+    execucao['parametros'].update(valores)
+
+
+def caminhos_relatorio(caminho_dados):
+    """Retorna (relatório da última execução, histórico) ao lado do arquivo de dados.
+
+    Ex.: data_work.parquet -> data_work_execucao.json e data_work_execucoes.jsonl.
+    """
+    base, _ = os.path.splitext(caminho_dados)
+    return f"{base}_execucao.json", f"{base}_execucoes.jsonl"
+
+
+def ler_historico(caminho_historico):
+    """Lê as execuções registradas no histórico (uma por linha), da mais antiga para a mais recente."""
+    if not os.path.exists(caminho_historico):
+        return []
+    with open(caminho_historico, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+
+def acrescentar_ao_historico(caminho_historico, historico, relatorio, maximo=MAXIMO_HISTORICO):
+    """Acrescenta o relatório ao histórico, que guarda no máximo as 'maximo' execuções mais recentes.
+
+    Enquanto há espaço, o relatório é só acrescentado ao final do arquivo; ao passar do limite, o histórico
+    é regravado (em um temporário renomeado) sem as execuções mais antigas.
+    """
+    if len(historico) < maximo:
+        with open(caminho_historico, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(json.dumps(relatorio, ensure_ascii=False) + '\n')
+        return
+    caminho_temp = caminho_historico + '.tmp'
+    with open(caminho_temp, 'w', encoding='utf-8') as arquivo:
+        for execucao in [*historico, relatorio][-maximo:]:
+            arquivo.write(json.dumps(execucao, ensure_ascii=False) + '\n')
+    os.replace(caminho_temp, caminho_historico)
+
+
+def comparar_com_historico(relatorio, historico, limite=LIMITE_LENTIDAO):
+    """Retorna {etapa: razão} das etapas mais lentas que 'limite' vezes a mediana das execuções anteriores.
+
+    Só entram na referência as execuções bem-sucedidas com os mesmos parâmetros de modo ('modo').
+    """
+    anteriores = [execucao for execucao in historico
+                  if execucao.get('sucesso') and execucao.get('modo') == relatorio.get('modo')][-EXECUCOES_REFERENCIA:]
+    lentas = {}
+    for etapa, medicao in relatorio['etapas'].items():
+        tempos = [execucao['etapas'][etapa]['segundos'] for execucao in anteriores if etapa in execucao['etapas']]
+        if tempos:
+            mediana = float(pd.Series(tempos).median())
+            if mediana > 0 and medicao['segundos'] > limite * mediana:
+                lentas[etapa] = medicao['segundos'] / mediana
+    return lentas
+
+
+def finalizar_execucao(execucao, caminho_dados, modo=None, erro=None):
+    """Fecha a execução, grava o relatório ao lado de 'caminho_dados', acrescenta-o ao histórico e o resume.
+
+    'modo' identifica execuções comparáveis entre si (ex.: em memória ou em blocos). Retorna o relatório.
+    """
+    relogio, cpu = execucao['relogios']
+    relatorio = {
+        'programa': execucao['programa'],
+        'inicio': execucao['inicio'],
+        'fim': datetime.now().isoformat(timespec='seconds'),
+        'sucesso': erro is None,
+        'erro': None if erro is None else f"{type(erro).__name__}: {erro}",
+        'modo': modo,
+        'parametros': execucao['parametros'],
+        'segundos': time.perf_counter() - relogio,
+        'cpu_segundos': time.process_time() - cpu,
+        'pico_rss_mb': pico_rss_mb(),
+        # Processos do tratamento em paralelo (contabilizados depois de encerrados)
+        'cpu_filhos_segundos': (sum(resource.getrusage(resource.RUSAGE_CHILDREN)[:2]) if resource else None),
+        'pico_rss_filhos_mb': pico_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+        'etapas': execucao['etapas'],
+    }
+    caminho_relatorio, caminho_historico = caminhos_relatorio(caminho_dados)
+    historico = ler_historico(caminho_historico)
+    lentas = comparar_com_historico(relatorio, historico)
+    with open(caminho_relatorio, 'w', encoding='utf-8') as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    acrescentar_ao_historico(caminho_historico, historico, relatorio)
+    resumir(relatorio, lentas)
+    return relatorio
+
+
+def resumir(relatorio, lentas=None):
+    """Mostra o tempo, a CPU, a memória e as linhas de cada etapa, destacando as lentas em relação ao histórico."""
+    lentas = lentas or {}
+    print(f"{relatorio['programa']}: {relatorio['segundos']:.1f} s, CPU {relatorio['cpu_segundos']:.1f} s, "
+          f"pico de memória {relatorio['pico_rss_mb'] or 0:.0f} MB"
+          + ('' if relatorio['sucesso'] else f" (falhou: {relatorio['erro']})"))
+    for etapa, medicao in relatorio['etapas'].items():
+        linhas = f"{medicao['linhas_entrada'] or '-'} -> {medicao['linhas_saida'] or '-'} linhas"
+        aviso = f"  <- {lentas[etapa]:.1f}x a mediana das execuções anteriores" if etapa in lentas else ''
+        print(f"  {etapa:<14} {medicao['segundos']:8.2f} s  CPU {medicao['cpu_segundos']:8.2f} s  "
+              f"pico {medicao['pico_rss_mb'] or 0:7.0f} MB (+{medicao['aumento_pico_mb'] or 0:.0f})  {linhas}{aviso}")
+
+
+def tendencia(caminho_historico, ultimas=EXECUCOES_REFERENCIA):
+    """Retorna uma tabela (etapa x execução) com os segundos das últimas execuções registradas no histórico.
+
+    As colunas são (posição no histórico, início): execuções iniciadas no mesmo segundo não se sobrepõem.
+    """
+    execucoes = list(enumerate(ler_historico(caminho_historico), start=1))[-ultimas:]
+    colunas = pd.MultiIndex.from_tuples([(numero, execucao['inicio']) for numero, execucao in execucoes],
+                                        names=['execucao', 'inicio'])
+    return pd.DataFrame([{etapa: medicao['segundos'] for etapa, medicao in execucao['etapas'].items()}
+                         for _, execucao in execucoes], index=colunas).T
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mostra a tendência dos tempos por etapa das últimas execuções.")
+    parser.add_argument('historico', nargs='?', default='data_work_execucoes.jsonl',
+                        help="Histórico de execuções (ex.: data_work_execucoes.jsonl ou dados_execucoes.jsonl).")
+    parser.add_argument('--ultimas', type=int, default=EXECUCOES_REFERENCIA)
+    args = parser.parse_args()
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:.2f}'.format):
+        print(tendencia(args.historico, args.ultimas))
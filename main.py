@@ -2,9 +2,9 @@
 import os
 from dotenv import load_dotenv  # Carregar dotenv
 import streamlit as st
-import pandas as pd
 from home import mostrar_home
-from graficos import mostrar_graficos
+from graficos import mostrar_censo, mostrar_graficos
+import cache_figuras  # Cache de figuras compartilhado (estatísticas para o admin)
 from auth import get_user_hospitals  # Importa a função para obter hospitais
 from mapeamento import mapeamento_hospital  # Importa o mapeamento de hospitais
 
@@ -141,6 +141,14 @@ def mostrar_creditos():
         st.subheader("**Rafael Lucindro Viegas**")
         st.write("Desenvolvedor Full-Stack - CEPETI")
 
+def mostrar_estatisticas_cache():
+    estatisticas = cache_figuras.estatisticas()
+    total = estatisticas['acertos'] + estatisticas['falhas']
+    taxa = estatisticas['acertos'] / total * 100 if total else 0
+    st.sidebar.caption(f"Cache de gráficos: {estatisticas['acertos']} acertos, {estatisticas['falhas']} falhas "
+                       f"({taxa:.0f}%), {estatisticas['entradas']} figuras, {estatisticas['mb']:.1f} MB, "
+                       f"{estatisticas['descartes']} descartes")
+
 def main():
     if st.session_state.logged_in:
         st.sidebar.image("assets/logo-qualidade.png")
@@ -165,8 +173,11 @@ def main():
             utis_disponiveis = mapeamento_hospital[hospital_selecionado]
             uti_selecionada = st.selectbox("Selecione uma UTI", utis_disponiveis)
             if uti_selecionada:
-                df = pd.read_csv('data_work.csv', encoding='utf-8')
-                mostrar_graficos(df, uti_selecionada)
+                mostrar_censo(uti_selecionada)
+                mostrar_graficos(uti_selecionada)
+        # Estatísticas do cache de gráficos (apenas para o admin), já contando os gráficos desta execução
+        if st.session_state.username == "admin":
+            mostrar_estatisticas_cache()
     else:
         login()
 
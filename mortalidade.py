@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+# Equação do APACHE II usada pelo painel: logito do risco de óbito = INTERCEPTO_APACHE + COEFICIENTE_APACHE * escore
+INTERCEPTO_APACHE = -3.517
+COEFICIENTE_APACHE = 0.146
+
+# Nível de confiança padrão dos intervalos da RMP
+NIVEL_CONFIANCA = 0.95
+
+
+def risco_apache(apache):
+    """Probabilidade de óbito prevista pelo APACHE II de cada paciente (NaN quando o escore falta)."""
+    apache = np.asarray(apache, dtype=float)
+    return 1 / (1 + np.exp(-(INTERCEPTO_APACHE + COEFICIENTE_APACHE * apache)))
+
+
+def saidas(df, coluna_uti='uti_combined'):
+    """Uma linha por internamento encerrado (alta ou óbito), a partir das linhas divididas por mês do dataset tratado.
+
+    Os segmentos do mesmo 'id' (split_admissions) são reunidos: a saída é o fim do último segmento. Internamentos
+    em aberto (sem desfecho) ficam de fora. Retorna 'id', 'uti', 'data_saida', 'obito', 'apache' e 'risco'.
+    """
+    encerrados = df[df['desfecho_uti'].notna() & df['data_hora_final'].notna()]
+    por_internamento = (encerrados.groupby('id', sort=False, observed=True)
+                        .agg(uti=(coluna_uti, 'first'), data_saida=('data_hora_final', 'max'),
+                             desfecho=('desfecho_uti', 'first'), apache=('apache', 'first'))
+                        .reset_index())
+    por_internamento['obito'] = (por_internamento.pop('desfecho') == 'Óbito').astype(int)
+    por_internamento['apache'] = pd.to_numeric(por_internamento['apache'], errors='coerce')
+    por_internamento['risco'] = risco_apache(por_internamento['apache'])
+    return por_internamento
+
+
+def intervalo_poisson(observados, nivel=NIVEL_CONFIANCA):
+    """Intervalo de confiança exato (Garwood) da média de uma contagem de Poisson. Retorna (inferior, superior)."""
+    # As contagens se repetem muito (óbitos por UTI e mês): os quantis são calculados uma vez por valor distinto
+    distintos, posicao = np.unique(np.asarray(observados, dtype=float), return_inverse=True)
+    alfa = 1 - nivel
+    # Limites de Garwood pela qui-quadrado: chi2(alfa/2, 2k) / 2 (zero se k = 0) e chi2(1 - alfa/2, 2k + 2) / 2
+    inferior = np.where(distintos > 0, chi2.ppf(alfa / 2, 2 * np.maximum(distintos, 1)) / 2, 0.0)
+    superior = chi2.ppf(1 - alfa / 2, 2 * distintos + 2) / 2
+    return inferior[posicao].reshape(np.shape(observados)), superior[posicao].reshape(np.shape(observados))
+
+
+def rmp(saidas, grupos=('uti',), frequencia='M', nivel=NIVEL_CONFIANCA):
+    """Óbitos observados e esperados, mortalidade e RMP com intervalo exato por grupo e mês de saída.
+
+    'saidas' vem de saidas(); todos os grupos (por padrão, todas as UTIs) saem de um único groupby.
+    Com grupos=() a tabela é da rede inteira. Mortalidade e saídas contam todos os internamentos
+    encerrados; observados, esperados e a RMP (observados / esperados) apenas os que têm APACHE II.
+    O intervalo da RMP é o intervalo de Poisson exato dos óbitos observados dividido pelos esperados.
+    """
+    periodo = saidas['data_saida'].dt.to_period(frequencia).rename('periodo')
+    com_risco = saidas['risco'].notna()
+    valores = pd.DataFrame({'saidas': 1, 'obitos': saidas['obito'], 'pacientes_apache': com_risco.astype(int),
+                            'observados': saidas['obito'].where(com_risco, 0), 'esperados': saidas['risco'].fillna(0)})
+    chaves = [saidas[grupo] for grupo in grupos] + [periodo]
+    tabela = valores.groupby(chaves, observed=True, sort=True).sum()
+
+    tabela['mortalidade'] = tabela['obitos'] / tabela['saidas']
+    pacientes = tabela['pacientes_apache'].where(tabela['pacientes_apache'] > 0)
+    tabela['mortalidade_predita'] = tabela['esperados'] / pacientes
+    esperados = tabela['esperados'].where(tabela['esperados'] > 0)
+    inferior, superior = intervalo_poisson(tabela['observados'].to_numpy(), nivel)
+    tabela['rmp'] = tabela['observados'] / esperados
+    tabela['rmp_inferior'] = inferior / esperados
+    tabela['rmp_superior'] = superior / esperados
+    return tabela
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Cadastro versionado dos leitos de cada UTI, com as datas de vigência
+ARQUIVO_LEITOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'leitos_uti.json')
+
+# Frequências aceitas em taxa_ocupacao: diária, semanal (segunda a domingo) e mensal (rótulo no dia 1)
+FREQUENCIAS = {'diaria': 'D', 'semanal': 'W-SUN', 'mensal': 'MS'}
+
+UM_DIA = np.timedelta64(1, 'D')
+
+
+def internacoes(df, coluna_uti='uti_combined'):
+    """Reconstrói um intervalo [início, fim) por internamento a partir das linhas do dataset tratado.
+
+    O treatment.py divide cada internamento em um segmento por mês (split_admissions), com os limites no
+    horário da admissão; os segmentos do mesmo 'id' são reunidos do primeiro início ao último fim.
+    Retorna um DataFrame com 'id', 'uti', 'inicio' e 'fim'.
+    """
+    validos = df[df['data_internamento'].notna() & df['data_hora_final'].notna()]
+    return (validos.groupby('id', sort=False, observed=True)
+            .agg(uti=(coluna_uti, 'first'), inicio=('data_internamento', 'min'), fim=('data_hora_final', 'max'))
+            .reset_index())
+
+
+def ocupacao_diaria(inicio, fim, unidades, primeiro_dia=None, ultimo_dia=None):
+    """Leitos-dia ocupados em cada dia e em cada unidade, por varredura dos intervalos de internamento.
+
+    Cada internamento [inicio, fim) soma a cada dia a fração do dia em que o paciente esteve na unidade
+    (1 nos dias completos), de modo que a soma de um período é o total de leitos-dia ocupados nele.
+    Os intervalos viram eventos +1 (dia da admissão) e -1 (dia seguinte ao da saída), acumulados por
+    unidade, mais a correção das frações do primeiro e do último dia: o custo é proporcional ao número
+    de internamentos mais o número de dias, sem expandir cada internamento em dias.
+    Internamentos sem unidade (NaN/None) são ignorados.
+    Retorna um DataFrame com um índice diário contínuo ('dia') de 'primeiro_dia' a 'ultimo_dia' (por
+    padrão, do primeiro ao último dia com paciente) e uma coluna por unidade.
+    """
+    inicio = pd.to_datetime(pd.Series(inicio)).to_numpy('datetime64[ns]')
+    fim = pd.to_datetime(pd.Series(fim)).to_numpy('datetime64[ns]')
+    unidades = pd.Series(unidades).to_numpy()
+    # Internamentos sem unidade ficam de fora: não há coluna onde somá-los
+    validos = ~(np.isnat(inicio) | np.isnat(fim)) & (fim > inicio) & pd.notna(unidades)
+    inicio, fim, unidades = inicio[validos], fim[validos], unidades[validos]
+    codigos, nomes = pd.factorize(unidades, sort=True)
+    if not len(inicio):
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='dia'), columns=nomes, dtype=float)
+
+    # Janela de dias: por padrão, do dia da primeira admissão ao último dia com algum tempo de internamento
+    origem = np.datetime64(primeiro_dia, 'D') if primeiro_dia is not None else inicio.min().astype('datetime64[D]')
+    ultimo = (np.datetime64(ultimo_dia, 'D') if ultimo_dia is not None
+              else (fim.max() - np.timedelta64(1, 'ns')).astype('datetime64[D]'))
+    dias = int((ultimo - origem) / UM_DIA) + 1
+    comeco, termino = origem.astype('datetime64[ns]'), (ultimo + UM_DIA).astype('datetime64[ns]')
+    dentro = (fim > comeco) & (inicio < termino)
+    inicio = np.maximum(inicio[dentro], comeco)
+    fim = np.minimum(fim[dentro], termino)
+    codigos = codigos[dentro]
+
+    # Dia (a partir da origem) e fração já decorrida do dia na admissão e na saída
+    dia_inicio = inicio.astype('datetime64[D]')
+    dia_fim = (fim - np.timedelta64(1, 'ns')).astype('datetime64[D]')
+    fracao_inicio = (inicio - dia_inicio) / UM_DIA
+    fracao_fim = (fim - dia_fim) / UM_DIA
+    posicao_inicio = ((dia_inicio - origem) / UM_DIA).astype(np.int64)
+    posicao_fim = ((dia_fim - origem) / UM_DIA).astype(np.int64)
+
+    # Eventos em uma matriz achatada (unidade x dia), com uma coluna a mais para o -1 do último dia
+    largura = dias + 1
+    base = codigos * largura
+    tamanho = len(nomes) * largura
+    degraus = (np.bincount(base + posicao_inicio, minlength=tamanho)
+               - np.bincount(base + posicao_fim + 1, minlength=tamanho))
+    correcoes = (np.bincount(base + posicao_inicio, weights=fracao_inicio, minlength=tamanho)
+                 + np.bincount(base + posicao_fim, weights=1 - fracao_fim, minlength=tamanho))
+    ocupados = np.cumsum(degraus.reshape(len(nomes), largura), axis=1) - correcoes.reshape(len(nomes), largura)
+
+    indice = pd.date_range(pd.Timestamp(origem), periods=dias, freq='D', name='dia')
+    return pd.DataFrame(ocupados[:, :dias].T, index=indice, columns=pd.Index(nomes, name='uti'))
+
+
+@lru_cache(maxsize=None)
+def carregar_leitos(caminho=ARQUIVO_LEITOS):
+    """Lê o cadastro de leitos por UTI (leitos_uti.json) uma única vez por processo.
+
+    Retorna um DataFrame com 'uti', 'leitos', 'inicio' (inclusive) e 'fim' (exclusive), com NaT nas
+    vigências sem início registrado ou ainda em vigor. Vigências vazias ou sobrepostas na mesma UTI
+    levantam ValueError. O DataFrame é compartilhado entre as chamadas e não deve ser alterado.
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        cadastro = json.load(arquivo)
+    vigencias = pd.DataFrame(cadastro['vigencias'], columns=['uti', 'leitos', 'inicio', 'fim'])
+    for coluna in ('inicio', 'fim'):
+        vigencias[coluna] = pd.to_datetime(vigencias[coluna], format='%Y-%m-%d')
+    vigencias = vigencias.sort_values(['uti', 'inicio'], na_position='first', ignore_index=True)
+
+    fim_anterior = vigencias.groupby('uti')['fim'].shift()
+    mesma_uti = vigencias['uti'].eq(vigencias['uti'].shift())
+    sobrepostas = mesma_uti & (fim_anterior.isna() | vigencias['inicio'].isna() | (fim_anterior > vigencias['inicio']))
+    invalidas = (vigencias['fim'] <= vigencias['inicio']) | sobrepostas
+    if invalidas.any():
+        utis = sorted(set(vigencias.loc[invalidas, 'uti']))
+        raise ValueError(f"Vigências vazias ou sobrepostas em {caminho}: {utis}")
+    return vigencias
+
+
+def vigencias_fixas(leitos):
+    """Converte um número fixo de leitos por UTI (dict ou Series) em vigências sem datas."""
+    leitos = pd.Series(leitos, dtype=float)
+    return pd.DataFrame({'uti': leitos.index, 'leitos': leitos.to_numpy(), 'inicio': pd.NaT, 'fim': pd.NaT})
+
+
+def leitos_diarios(vigencias, ocupados):
+    """Leitos disponíveis em cada dia e unidade de 'ocupados', pela junção dos dias com as vigências.
+
+    Cada vigência soma os seus leitos do dia de início ao dia anterior ao fim, pela mesma varredura de
+    ocupacao_diaria (um evento por vigência, sem expandir os dias). Dias sem vigência ficam sem valor.
+    """
+    dias = len(ocupados.index)
+    largura = dias + 1
+    vigencias = vigencias[vigencias['uti'].isin(ocupados.columns)]
+    base = ocupados.columns.get_indexer(vigencias['uti']) * largura
+    tamanho = len(ocupados.columns) * largura
+    if dias:
+        origem = ocupados.index[0]
+        posicao_inicio = ((vigencias['inicio'] - origem) / pd.Timedelta(days=1)).fillna(0).clip(0, dias)
+        posicao_fim = ((vigencias['fim'] - origem) / pd.Timedelta(days=1)).fillna(dias).clip(0, dias)
+    else:
+        posicao_inicio = posicao_fim = pd.Series(0.0, index=vigencias.index)
+    inicio = base + posicao_inicio.to_numpy(np.int64)
+    fim = base + posicao_fim.to_numpy(np.int64)
+    leitos = vigencias['leitos'].to_numpy(float)
+
+    def acumular(pesos):
+        eventos = (np.bincount(inicio, weights=pesos, minlength=tamanho)
+                   - np.bincount(fim, weights=pesos, minlength=tamanho))
+        return np.cumsum(eventos.reshape(len(ocupados.columns), largura), axis=1)[:, :dias]
+
+    disponiveis = np.where(acumular(None) > 0, acumular(leitos), np.nan)
+    return pd.DataFrame(disponiveis.T, index=ocupados.index, columns=ocupados.columns)
+
+
+def taxa_ocupacao(ocupados, leitos=None, frequencia='mensal'):
+    """Taxa de ocupação (%) por período: leitos-dia ocupados / leitos-dia disponíveis no período.
+
+    'ocupados' vem de ocupacao_diaria. 'leitos' são as vigências de leitos por UTI (DataFrame como o de
+    carregar_leitos, o padrão) ou um número fixo por UTI (dict ou Series). 'frequencia' é 'diaria',
+    'semanal' ou 'mensal'; cada período soma os leitos de cada um dos seus dias, de modo que meses de 28 a
+    31 dias, períodos parciais nas pontas e mudanças no número de leitos entram na taxa. Dias fora de
+    qualquer vigência não contam nem no numerador nem no denominador.
+    """
+    if leitos is None:
+        leitos = carregar_leitos()
+    elif not isinstance(leitos, pd.DataFrame):
+        leitos = vigencias_fixas(leitos)
+    capacidade = leitos_diarios(leitos, ocupados)
+    regra = FREQUENCIAS[frequencia]
+    disponiveis = capacidade.resample(regra).sum(min_count=1)
+    ocupados = ocupados.where(capacidade.notna()).resample(regra).sum()
+    taxa = ocupados / disponiveis.where(disponiveis > 0) * 100
+    return taxa.rename_axis('periodo')